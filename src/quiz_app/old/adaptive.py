@@ -0,0 +1,279 @@
+import bisect
+import json
+import math
+import random
+from array import array
+from collections import defaultdict
+from types import SimpleNamespace
+from question import question_key
+from metrics import REGISTRY
+
+ITEMS_ADMINISTERED = REGISTRY.counter('adaptive_items_total', 'Items administered in adaptive sessions')
+ITEM_BANKS_BUILT = REGISTRY.counter('adaptive_item_banks_built_total', 'Information tables precomputed')
+ABILITY_STANDARD_ERROR = REGISTRY.histogram('adaptive_final_standard_error', 'Standard error when a session stops',
+                                            buckets=(0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0))
+
+# Ability grid shared by the information tables and the posterior
+GRID_MIN, GRID_MAX, GRID_STEP = -4.0, 4.0, 0.25
+GRID = [GRID_MIN + i * GRID_STEP for i in range(int((GRID_MAX - GRID_MIN) / GRID_STEP) + 1)]
+MAX_DIFFICULTY = 4.0
+
+
+def _logistic(value):
+    if value >= 0:
+        return 1.0 / (1.0 + math.exp(-value))
+    exp_value = math.exp(value)
+    return exp_value / (1.0 + exp_value)
+
+
+def probability(theta, discrimination, difficulty):
+    """Two-parameter logistic probability of a correct answer"""
+    return _logistic(discrimination * (theta - difficulty))
+
+
+def information(theta, discrimination, difficulty):
+    """Fisher information of an item at ability theta"""
+    p = probability(theta, discrimination, difficulty)
+    return discrimination * discrimination * p * (1.0 - p)
+
+
+class ItemCalibration:
+    """Item parameters calibrated from attempt data, plus cached information tables"""
+
+    def __init__(self, default_discrimination=1.0):
+        """
+        Initialize an empty calibration
+
+        Args:
+            default_discrimination (float): Discrimination used for every item
+        """
+        self.default_discrimination = default_discrimination
+        self.parameters = {}
+        self._banks = {}
+
+    def calibrate(self, attempts, prior_attempts=2.0):
+        """
+        Estimate item difficulties from (question key, correct) attempts
+
+        Difficulty is the logit of the smoothed error rate, which places an
+        item answered correctly half the time at ability 0. Items without
+        attempts keep difficulty 0.
+
+        Args:
+            attempts (iterable): (question_key, is_correct) pairs
+            prior_attempts (float): Pseudo-attempts pulling sparse items toward 50%
+        """
+        totals = defaultdict(lambda: [0, 0])
+        for key, is_correct in attempts:
+            entry = totals[key]
+            entry[1] += 1
+            if is_correct:
+                entry[0] += 1
+
+        a = self.default_discrimination
+        for key, (correct, answered) in totals.items():
+            p = (correct + prior_attempts / 2) / (answered + prior_attempts)
+            difficulty = -math.log(p / (1.0 - p)) / a
+            self.parameters[key] = (a, max(-MAX_DIFFICULTY, min(MAX_DIFFICULTY, difficulty)))
+        self._banks.clear()
+
+    def calibrate_from_log(self, log_path, prior_attempts=2.0):
+        """
+        Calibrate from an answer log written by AnswerPipeline
+
+        Args:
+            log_path (str): JSON-lines answer log
+            prior_attempts (float): See calibrate()
+        """
+        def attempts():
+            with open(log_path, mode='r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry.get('answer') is None:
+                        continue
+                    fields = SimpleNamespace(category=entry['category'], subcategory=entry['subcategory'],
+                                             question=entry['question'])
+                    yield question_key(fields), bool(entry['correct'])
+
+        self.calibrate(attempts(), prior_attempts)
+
+    def item_parameters(self, question):
+        """Return (discrimination, difficulty) for a question"""
+        return self.parameters.get(question_key(question), (self.default_discrimination, 0.0))
+
+    def item_bank(self, questions, cache_key=None):
+        """
+        Return the item bank for a question pool, building its tables once
+
+        A cached bank is only reused if it holds exactly the same questions, so
+        two banks sharing a category and subcategory never swap tables.
+
+        Args:
+            questions (list): Candidate LoadQuestion objects
+            cache_key (hashable, optional): Key to reuse the tables, e.g. (category, subcategory)
+
+        Returns:
+            ItemBank: Bank with precomputed information tables
+        """
+        keys = array('I', (question_key(question) for question in questions))
+        if cache_key is not None:
+            cached = self._banks.get(cache_key)
+            if cached is not None and cached.keys == keys:
+                return cached
+        bank = ItemBank(questions, [self.item_parameters(question) for question in questions], keys)
+        if cache_key is not None:
+            self._banks[cache_key] = bank
+        return bank
+
+
+class ItemBank:
+    """Questions with information tables sorted per ability bucket"""
+
+    def __init__(self, questions, parameters, keys=None):
+        """
+        Precompute, for every grid point, items ordered by information and
+        the end of each run of equally informative items
+
+        Args:
+            questions (list): LoadQuestion objects
+            parameters (list): (discrimination, difficulty) per question
+            keys (array, optional): question_key() per question, computed if omitted
+        """
+        self.questions = list(questions)
+        self.keys = keys if keys is not None else array('I', (question_key(q) for q in self.questions))
+        self.discrimination = array('d', (a for a, _ in parameters))
+        self.difficulty = array('d', (b for _, b in parameters))
+        self.tables = []
+        self.run_ends = []
+        count = len(self.questions)
+        for theta in GRID:
+            values = [information(theta, self.discrimination[i], self.difficulty[i]) for i in range(count)]
+            order = sorted(range(count), key=lambda i: -values[i])
+            ends = array('I', (position for position in range(1, count)
+                               if values[order[position]] != values[order[position - 1]]))
+            if count:
+                ends.append(count)
+            self.tables.append(array('I', order))
+            self.run_ends.append(ends)
+        ITEM_BANKS_BUILT.inc()
+
+    def __len__(self):
+        return len(self.questions)
+
+
+def grid_index(theta):
+    """Return the index of the grid point closest to theta"""
+    position = bisect.bisect_left(GRID, theta)
+    if position == 0:
+        return 0
+    if position == len(GRID):
+        return len(GRID) - 1
+    return position if GRID[position] - theta < theta - GRID[position - 1] else position - 1
+
+
+class AdaptiveSession:
+    """One examinee's adaptive test over an item bank"""
+
+    def __init__(self, bank, max_items=20, target_standard_error=0.3, rng=None):
+        """
+        Initialize the session with a standard normal ability prior
+
+        Args:
+            bank (ItemBank): Items to draw from
+            max_items (int): Upper bound on administered items
+            target_standard_error (float): Stop once the ability estimate is this precise
+            rng (random.Random, optional): Breaks ties between equally informative items
+        """
+        self.bank = bank
+        self.rng = rng or random.Random()
+        self.max_items = min(max_items, len(bank))
+        self.target_standard_error = target_standard_error
+        self.log_posterior = [-theta * theta / 2 for theta in GRID]
+        self.administered = set()
+        self.responses = []
+        self._cursors = [0] * len(GRID)
+        self.theta = 0.0
+        self.standard_error = 1.0
+
+    def finished(self):
+        """Return True once the length or precision stopping rule is met"""
+        return (len(self.responses) >= self.max_items
+                or (self.responses and self.standard_error <= self.target_standard_error))
+
+    def next_item(self):
+        """
+        Pick the most informative unadministered item at the current estimate
+
+        Walks the precomputed table for the nearest ability bucket; the
+        per-bucket cursor skips items administered earlier in this session.
+        Equally informative items (such as every uncalibrated item) are
+        drawn at random from their run rather than always served in bank
+        order. Runs are precomputed, so a step costs O(log n) for the run
+        lookup plus expected O(1) draws, or a scan of a run no longer than
+        twice the items administered so far.
+
+        Returns:
+            int: Item index, or None if the session is finished
+        """
+        if self.finished():
+            return None
+        bucket = grid_index(self.theta)
+        table = self.bank.tables[bucket]
+        cursor = self._cursors[bucket]
+        while cursor < len(table) and table[cursor] in self.administered:
+            cursor += 1
+        self._cursors[bucket] = cursor
+        if cursor == len(table):
+            return None
+
+        ends = self.bank.run_ends[bucket]
+        end = ends[bisect.bisect_right(ends, cursor)]
+        if end - cursor > 2 * len(self.administered):
+            # Administered items fill under half the run, so draws rarely miss
+            while True:
+                item = table[self.rng.randrange(cursor, end)]
+                if item not in self.administered:
+                    return item
+        candidates = [table[position] for position in range(cursor, end)
+                      if table[position] not in self.administered]
+        return self.rng.choice(candidates)
+
+    def skip(self, item):
+        """
+        Exclude an item without a response, e.g. when its answer was not admitted
+
+        Args:
+            item (int): Item index returned by next_item()
+        """
+        self.administered.add(item)
+        self.responses.append((item, None))
+
+    def record(self, item, is_correct):
+        """
+        Update the ability posterior with one response
+
+        Args:
+            item (int): Item index returned by next_item()
+            is_correct (bool): Whether the answer was correct
+        """
+        a = self.bank.discrimination[item]
+        b = self.bank.difficulty[item]
+        for i, theta in enumerate(GRID):
+            p = probability(theta, a, b)
+            self.log_posterior[i] += math.log(max(p if is_correct else 1.0 - p, 1e-12))
+        self.administered.add(item)
+        self.responses.append((item, is_correct))
+        ITEMS_ADMINISTERED.inc()
+
+        # Expected a posteriori estimate over the grid
+        peak = max(self.log_posterior)
+        weights = [math.exp(value - peak) for value in self.log_posterior]
+        total = sum(weights)
+        mean = sum(w * theta for w, theta in zip(weights, GRID)) / total
+        variance = sum(w * (theta - mean) ** 2 for w, theta in zip(weights, GRID)) / total
+        self.theta = mean
+        self.standard_error = math.sqrt(variance)
+        if self.finished():
+            ABILITY_STANDARD_ERROR.observe(self.standard_error)
@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import OrderedDict
+from metrics import REGISTRY
+
+ADMISSIONS = REGISTRY.counter('admission_decisions_total', 'Admission decisions by action and result')
+TRACKED_CLIENTS = REGISTRY.gauge('admission_tracked_clients', 'Clients with live rate limiter state')
+ACTIVE_SESSIONS = REGISTRY.gauge('admission_active_sessions', 'Admitted sessions currently running per bank')
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed by admission control"""
+
+    def __init__(self, reason, retry_after=None):
+        self.reason = reason
+        self.retry_after = retry_after
+        message = f"Request rejected: {reason}"
+        if retry_after:
+            message += f" (retry in {retry_after:.1f}s)"
+        super().__init__(message)
+
+
+class RateLimiter:
+    """Token buckets per key, refilled lazily on access and bounded in number"""
+
+    def __init__(self, rate, burst, max_keys=100000, clock=time.monotonic):
+        """
+        Initialize the limiter
+
+        Args:
+            rate (float): Tokens added per second
+            burst (float): Bucket capacity
+            max_keys (int): Most keys tracked at once; the least recently seen are dropped
+            clock (callable): Monotonic time source
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        # Time for an empty bucket to refill; idle keys past it are indistinguishable from new ones
+        self.idle_expiry = burst / rate if rate > 0 else float('inf')
+        # key -> [tokens, last_update], ordered by last access
+        self._buckets = OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _expire(self, now):
+        """Drop least recently used keys that have refilled completely or exceed the cap"""
+        buckets = self._buckets
+        while buckets:
+            key, (_, updated) = next(iter(buckets.items()))
+            if len(buckets) > self.max_keys or now - updated >= self.idle_expiry:
+                buckets.popitem(last=False)
+            else:
+                break
+
+    def try_acquire(self, key, cost=1.0):
+        """
+        Take tokens from a key's bucket
+
+        Not thread-safe on its own; AdmissionController serializes calls.
+
+        Args:
+            key (hashable): Client identifier
+            cost (float): Tokens required
+
+        Returns:
+            float: 0 if admitted, otherwise seconds until enough tokens accrue
+        """
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.burst, now]
+            self._buckets[key] = bucket
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            admitted = True
+        else:
+            admitted = False
+
+        self._expire(now)
+        if admitted:
+            return 0.0
+        return (cost - bucket[0]) / self.rate if self.rate > 0 else float('inf')
+
+    def refund(self, key, cost=1.0):
+        """Return tokens taken by a request that was rejected further along"""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket[0] = min(self.burst, bucket[0] + cost)
+
+
+class SessionTicket:
+    """Handle for an admitted session; release it when the session ends"""
+
+    def __init__(self, controller, bank):
+        self._controller = controller
+        self.bank = bank
+        self._released = False
+
+    def release(self):
+        """Free the session slot (idempotent)"""
+        if not self._released:
+            self._released = True
+            self._controller._end_session(self.bank)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class AdmissionController:
+    """Per-user and global rate limits, per-bank session caps and queue-depth shedding"""
+
+    def __init__(self, session_rate=(0.2, 3), answer_rate=(2.0, 10), global_rate=(500.0, 1000),
+                 max_sessions_per_bank=1000, queue_depth=None, max_queue_depth=5000,
+                 max_clients=100000, clock=time.monotonic):
+        """
+        Initialize admission control
+
+        Args:
+            session_rate (tuple): (per-second rate, burst) of session starts per user
+            answer_rate (tuple): (per-second rate, burst) of answer submissions per user
+            global_rate (tuple): (per-second rate, burst) of all requests combined
+            max_sessions_per_bank (int): Concurrent sessions allowed on one bank
+            queue_depth (callable, optional): Returns the current ingestion backlog
+            max_queue_depth (int): Backlog above which answers are shed
+            max_clients (int): Most users tracked by each per-user limiter
+            clock (callable): Monotonic time source
+        """
+        self._sessions = RateLimiter(*session_rate, max_keys=max_clients, clock=clock)
+        self._answers = RateLimiter(*answer_rate, max_keys=max_clients, clock=clock)
+        self._global = RateLimiter(*global_rate, max_keys=1, clock=clock)
+        self.max_sessions_per_bank = max_sessions_per_bank
+        self.queue_depth = queue_depth
+        self.max_queue_depth = max_queue_depth
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def _reject(self, action, reason, retry_after=None):
+        ADMISSIONS.inc(action=action, result=reason)
+        raise AdmissionRejected(reason, retry_after)
+
+    def _check_rate(self, action, limiter, user_id):
+        """
+        Apply the per-user and global buckets; caller holds the lock
+
+        The user's bucket is checked first so a client over its own limit
+        never spends global capacity and locks everyone else out.
+        """
+        retry_after = limiter.try_acquire(user_id)
+        TRACKED_CLIENTS.set(len(self._sessions) + len(self._answers))
+        if retry_after:
+            self._reject(action, 'user_rate', retry_after)
+        retry_after = self._global.try_acquire(None)
+        if retry_after:
+            limiter.refund(user_id)
+            self._reject(action, 'global_rate', retry_after)
+
+    def start_session(self, user_id, bank):
+        """
+        Admit a new quiz session
+
+        Args:
+            user_id (str): User starting the session
+            bank (str): Bank or subcategory the session draws from
+
+        Returns:
+            SessionTicket: Release it when the session ends
+
+        Raises:
+            AdmissionRejected: If a limit is exceeded
+        """
+        with self._lock:
+            if self._active.get(bank, 0) >= self.max_sessions_per_bank:
+                self._reject('session', 'bank_full')
+            self._check_rate('session', self._sessions, user_id)
+            self._active[bank] = self._active.get(bank, 0) + 1
+            ACTIVE_SESSIONS.set(self._active[bank], bank=bank)
+        ADMISSIONS.inc(action='session', result='admitted')
+        return SessionTicket(self, bank)
+
+    def _end_session(self, bank):
+        with self._lock:
+            remaining = self._active.get(bank, 0) - 1
+            if remaining > 0:
+                self._active[bank] = remaining
+            else:
+                self._active.pop(bank, None)
+                remaining = 0
+            ACTIVE_SESSIONS.set(remaining, bank=bank)
+
+    def admit_answer(self, user_id):
+        """
+        Admit an answer submission
+
+        Args:
+            user_id (str): User submitting the answer
+
+        Raises:
+            AdmissionRejected: If the backlog is too deep or a rate limit is exceeded
+        """
+        # Checked without the lock so overload is shed as cheaply as possible
+        if self.queue_depth is not None and self.queue_depth() > self.max_queue_depth:
+            self._reject('answer', 'overloaded')
+        with self._lock:
+            self._check_rate('answer', self._answers, user_id)
+        ADMISSIONS.inc(action='answer', result='admitted')
@@ -0,0 +1,310 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from question import LoadQuestion
+from metrics import REGISTRY
+
+LINT_FILES = REGISTRY.counter('lint_files_total', 'Banks linted by cache result')
+LINT_FINDINGS = REGISTRY.counter('lint_findings_total', 'Lint findings by severity')
+LINT_SECONDS = REGISTRY.histogram('lint_run_seconds', 'Wall time of a full lint run')
+
+# Bump when checks change so cached results are not reused
+LINT_VERSION = 1
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Legacy layout read by QuizLoader
+LEGACY_COLUMNS = ['category', 'subcategory', 'question', 'option1', 'option2', 'option3', 'option4', 'answer']
+# Layout used by the banks under resources/data/quizzes
+ID_COLUMN_COUNT = 9  # ID, Question, Option A-D, Correct Option, Timer, Explanation
+
+MANIFEST_COLUMNS = ['category', 'sub_category', 'quiz_file_path']
+
+
+def _finding(file_path, line, code, severity, message):
+    return {'file': str(file_path), 'line': line, 'code': code, 'severity': severity, 'message': message}
+
+
+def content_hash(file_path):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, mode='rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _row_fields(schema, row, file_path):
+    """Map a data row onto (category, subcategory, question, options, answer, timer)"""
+    if schema == 'legacy':
+        return row[0].strip(), row[1].strip(), row[2].strip(), row[3:7], row[7].strip(), None
+    # ID layout carries no category columns; those come from the manifest
+    stem = Path(file_path).stem
+    return stem, stem, row[1].strip(), row[2:6], row[6].strip(), row[7].strip()
+
+
+def lint_bank(file_path):
+    """
+    Check a single question bank
+
+    Args:
+        file_path (str): Path to the CSV bank
+
+    Returns:
+        list: Finding dicts with file, line, code, severity and message
+    """
+    findings = []
+    try:
+        with open(file_path, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            try:
+                header = next(reader)
+            except StopIteration:
+                return [_finding(file_path, 1, 'empty-file', ERROR, "CSV file is empty")]
+
+            normalized = [column.strip().lower() for column in header]
+            if normalized[:len(LEGACY_COLUMNS)] == LEGACY_COLUMNS:
+                schema, min_columns = 'legacy', len(LEGACY_COLUMNS)
+            elif normalized and normalized[0] == 'id' and len(header) >= ID_COLUMN_COUNT:
+                schema, min_columns = 'id', ID_COLUMN_COUNT
+                findings.append(_finding(
+                    file_path, 1, 'loader-schema', WARNING,
+                    f"ID-based layout is not the category,subcategory,... layout QuizLoader.load_questions reads; "
+                    f"every row would be rejected at quiz time"))
+            else:
+                return findings + [_finding(file_path, 1, 'unknown-header', ERROR,
+                                            f"Unrecognized header: {header}")]
+
+            seen_questions = {}
+            for row in reader:
+                line = reader.line_num
+                if not any(cell.strip() for cell in row):
+                    continue
+                if len(row) < min_columns:
+                    findings.append(_finding(file_path, line, 'columns', ERROR,
+                                             f"Insufficient columns ({len(row)}/{min_columns})"))
+                    continue
+
+                category, subcategory, question_text, options, answer, timer = _row_fields(schema, row, file_path)
+
+                for index, option in enumerate(options):
+                    letter = chr(65 + index)
+                    if not option.strip():
+                        findings.append(_finding(file_path, line, 'empty-option', WARNING,
+                                                 f"Option {letter} is empty"))
+                    elif option.strip().lower() == 'nan':
+                        findings.append(_finding(file_path, line, 'nan-option', WARNING,
+                                                 f"Option {letter} is a literal 'nan'"))
+
+                if timer is not None and not (timer.isdigit() and int(timer) > 0):
+                    findings.append(_finding(file_path, line, 'timer', WARNING,
+                                             f"Timer '{timer}' is not a positive whole number"))
+
+                if question_text:
+                    previous_line = seen_questions.setdefault(question_text, line)
+                    if previous_line != line:
+                        findings.append(_finding(file_path, line, 'duplicate-question', WARNING,
+                                                 f"Same question text as line {previous_line}"))
+
+                try:
+                    LoadQuestion(category=category, subcategory=subcategory, question=question_text,
+                                 options=[option for option in options if option.strip()], answer=answer)
+                except ValueError as e:
+                    findings.append(_finding(file_path, line, 'invalid-question', ERROR, str(e)))
+
+    except UnicodeDecodeError as e:
+        findings.append(_finding(file_path, None, 'encoding', ERROR, f"Not valid UTF-8: {e}"))
+    except csv.Error as e:
+        findings.append(_finding(file_path, None, 'csv', ERROR, f"CSV format error: {e}"))
+    except OSError as e:
+        findings.append(_finding(file_path, None, 'io', ERROR, f"Cannot read file: {e}"))
+
+    return findings
+
+
+def _normalize_name(name):
+    """Reduce '02_chemistry' and 'Chemistry' to the same comparable form"""
+    return re.sub(r'[^a-z]', '', re.sub(r'^\d+_', '', name.lower()))
+
+
+def resolve_manifest_path(raw_path, manifest_path, project_root):
+    """
+    Resolve a manifest Quiz_File_Path entry written with Windows separators
+
+    Args:
+        raw_path (str): Path as written in the manifest
+        manifest_path (Path): Manifest location
+        project_root (Path): Repository root
+
+    Returns:
+        Path: Best-effort resolved path (may not exist)
+    """
+    parts = [part for part in re.split(r'[\\/]+', raw_path.strip()) if part and part != '.']
+    candidate = (manifest_path.parent.joinpath(*parts)).resolve()
+    if candidate.exists():
+        return candidate
+    while parts and parts[0] == '..':
+        parts.pop(0)
+    return project_root.joinpath(*parts).resolve()
+
+
+def lint_manifest(manifest_path, project_root, bank_paths=()):
+    """
+    Check the category/subcategory manifest against the banks on disk
+
+    Args:
+        manifest_path (str): Path to category_subcategory.csv
+        project_root (str): Repository root the manifest paths are relative to
+        bank_paths (iterable): Bank files found on disk
+
+    Returns:
+        list: Finding dicts
+    """
+    manifest_path = Path(manifest_path)
+    project_root = Path(project_root)
+    findings = []
+    referenced = {}
+    seen_pairs = {}
+
+    try:
+        with open(manifest_path, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            try:
+                header = next(reader)
+            except StopIteration:
+                return [_finding(manifest_path, 1, 'empty-file', ERROR, "Manifest is empty")]
+            if [column.strip().lower() for column in header[:3]] != MANIFEST_COLUMNS:
+                return [_finding(manifest_path, 1, 'unknown-header', ERROR,
+                                 f"Expected columns {MANIFEST_COLUMNS}, found {header}")]
+
+            for row in reader:
+                line = reader.line_num
+                if not any(cell.strip() for cell in row):
+                    continue
+                if len(row) < 3:
+                    findings.append(_finding(manifest_path, line, 'columns', ERROR,
+                                             f"Insufficient columns ({len(row)}/3)"))
+                    continue
+                category, subcategory, raw_path = (cell.strip() for cell in row[:3])
+
+                pair = (category, subcategory)
+                if pair in seen_pairs:
+                    findings.append(_finding(manifest_path, line, 'duplicate-entry', ERROR,
+                                             f"{category} > {subcategory} already mapped on line {seen_pairs[pair]}"))
+                else:
+                    seen_pairs[pair] = line
+
+                bank_path = resolve_manifest_path(raw_path, manifest_path, project_root)
+                if not bank_path.exists():
+                    findings.append(_finding(manifest_path, line, 'missing-bank', ERROR,
+                                             f"Bank file not found: {raw_path}"))
+                    continue
+
+                if bank_path in referenced:
+                    findings.append(_finding(manifest_path, line, 'duplicate-bank', WARNING,
+                                             f"{bank_path.name} is also mapped on line {referenced[bank_path]}"))
+                referenced.setdefault(bank_path, line)
+
+                if _normalize_name(subcategory) != _normalize_name(bank_path.stem):
+                    findings.append(_finding(manifest_path, line, 'subcategory-mismatch', WARNING,
+                                             f"{category} > {subcategory} points at {bank_path.name}"))
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        return [_finding(manifest_path, None, 'io', ERROR, f"Cannot read manifest: {e}")]
+
+    for bank_path in bank_paths:
+        if Path(bank_path).resolve() not in referenced:
+            findings.append(_finding(manifest_path, None, 'unmapped-bank', WARNING,
+                                     f"{bank_path} is not listed in the manifest"))
+    return findings
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, mode='r', encoding='utf-8') as file:
+            cache = json.load(file)
+        if cache.get('version') == LINT_VERSION:
+            return cache.get('files', {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_cache(cache_path, files):
+    tmp_path = f'{cache_path}.tmp'
+    with open(tmp_path, mode='w', encoding='utf-8') as file:
+        json.dump({'version': LINT_VERSION, 'files': files}, file)
+    os.replace(tmp_path, cache_path)
+
+
+def lint_all(data_dir, project_root, cache_path=None, jobs=None):
+    """
+    Lint every bank under data_dir/quizzes and the manifest
+
+    Banks whose content hash matches the cache are not re-checked; the rest
+    are checked in parallel worker processes.
+
+    Args:
+        data_dir (str): The resources/data directory
+        project_root (str): Repository root the manifest paths are relative to
+        cache_path (str, optional): JSON cache of findings keyed by content hash
+        jobs (int, optional): Worker processes, defaults to the CPU count
+
+    Returns:
+        tuple: (findings list, stats dict)
+    """
+    start_time = time.perf_counter()
+    data_dir = Path(data_dir)
+    bank_paths = sorted(str(path) for path in (data_dir / 'quizzes').rglob('*.csv'))
+    cached = _load_cache(cache_path) if cache_path else {}
+
+    results = {}
+    stale = []
+    for bank_path in bank_paths:
+        digest = content_hash(bank_path)
+        entry = cached.get(bank_path)
+        if entry and entry.get('hash') == digest:
+            results[bank_path] = entry
+            LINT_FILES.inc(cache='hit')
+        else:
+            stale.append((bank_path, digest))
+            LINT_FILES.inc(cache='miss')
+
+    if len(stale) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            checked = list(executor.map(lint_bank, [bank_path for bank_path, _ in stale]))
+    else:
+        checked = [lint_bank(bank_path) for bank_path, _ in stale]
+    for (bank_path, digest), findings in zip(stale, checked):
+        results[bank_path] = {'hash': digest, 'findings': findings}
+
+    if cache_path:
+        _save_cache(cache_path, results)
+
+    findings = [finding for bank_path in bank_paths for finding in results[bank_path]['findings']]
+    findings.extend(lint_manifest(data_dir / 'category_subcategory.csv', project_root, bank_paths))
+
+    for finding in findings:
+        LINT_FINDINGS.inc(severity=finding['severity'])
+    elapsed_time = time.perf_counter() - start_time
+    LINT_SECONDS.observe(elapsed_time)
+
+    stats = {
+        'banks': len(bank_paths),
+        'rechecked': len(stale),
+        'errors': sum(1 for finding in findings if finding['severity'] == ERROR),
+        'warnings': sum(1 for finding in findings if finding['severity'] == WARNING),
+        'seconds': elapsed_time,
+    }
+    return findings, stats
+
+
+def format_finding(finding):
+    """Render a finding as a single human-readable line"""
+    location = finding['file'] if finding['line'] is None else f"{finding['file']}:{finding['line']}"
+    return f"{location}: {finding['severity']} [{finding['code']}] {finding['message']}"
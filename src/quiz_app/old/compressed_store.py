@@ -0,0 +1,185 @@
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from question import LoadQuestion, question_key
+from metrics import REGISTRY
+
+BLOCK_LOOKUPS = REGISTRY.counter('compressed_block_lookups_total', 'Compressed block cache lookups by result')
+COMPRESSED_BYTES = REGISTRY.gauge('compressed_bank_bytes', 'Compressed text bytes held per bank')
+RAW_BYTES = REGISTRY.gauge('compressed_bank_raw_bytes', 'Uncompressed text bytes represented per bank')
+
+FIELD_SEPARATOR = '\x1f'
+RECORD_SEPARATOR = '\x1e'
+MAX_DICTIONARY_BYTES = 32 * 1024  # zlib window size
+
+
+def build_dictionary(records, size=16 * 1024):
+    """
+    Build a zlib preset dictionary from records sampled across a bank
+
+    Args:
+        records (list): Encoded question records
+        size (int): Target dictionary size in bytes
+
+    Returns:
+        bytes: Dictionary contents
+    """
+    size = min(size, MAX_DICTIONARY_BYTES)
+    if not records:
+        return b''
+    step = max(1, len(records) // 256)
+    sample = []
+    total = 0
+    for record in records[::step]:
+        encoded = record.encode('utf-8')
+        sample.append(encoded)
+        total += len(encoded)
+        if total >= size:
+            break
+    # zlib favours matches near the end of the dictionary
+    return b''.join(reversed(sample))[-size:]
+
+
+class CompressedQuestion(LoadQuestion):
+    """LoadQuestion whose text and options live in a compressed block"""
+
+    def __init__(self, bank, index, category, subcategory, answer):
+        # Validation happened when the bank was first loaded
+        self._bank = bank
+        self._index = index
+        self.category = category
+        self.subcategory = subcategory
+        self.answer = answer
+
+    @property
+    def review_key(self):
+        return self._bank.review_key(self._index)
+
+    @property
+    def question(self):
+        return self._bank.record(self._index)[0]
+
+    @property
+    def options(self):
+        return list(self._bank.record(self._index)[1:])
+
+
+class CompressedBank:
+    """Question bank holding text in zlib blocks with a bounded cache of hot blocks"""
+
+    def __init__(self, questions, block_size=64, cache_blocks=16, level=6, bank=''):
+        """
+        Compress a list of questions
+
+        Args:
+            questions (list): LoadQuestion objects to store
+            block_size (int): Questions per compressed block
+            cache_blocks (int): Decompressed blocks kept in the LRU cache
+            level (int): zlib compression level
+            bank (str): Label used for metrics
+        """
+        self.block_size = max(1, block_size)
+        self.cache_blocks = max(1, cache_blocks)
+        self.bank = bank
+
+        # Category pairs, answers and review keys stay resident so filtering
+        # and review scheduling never decompress
+        self._pairs = []
+        pair_index = {}
+        self._pair_ids = array('H')
+        self._answers = array('B')  # Answer letters as code points
+        self._keys = array('I')
+        records = []
+        for question in questions:
+            pair = (sys.intern(question.category), sys.intern(question.subcategory))
+            if pair not in pair_index:
+                pair_index[pair] = len(self._pairs)
+                self._pairs.append(pair)
+            self._pair_ids.append(pair_index[pair])
+            self._answers.append(ord(question.answer))
+            self._keys.append(question_key(question))
+            records.append(FIELD_SEPARATOR.join([question.question, *question.options]))
+
+        self._dictionary = build_dictionary(records)
+        self._blocks = []
+        raw_bytes = 0
+        for start in range(0, len(records), self.block_size):
+            text = RECORD_SEPARATOR.join(records[start:start + self.block_size]).encode('utf-8')
+            raw_bytes += len(text)
+            compressor = zlib.compressobj(level, zdict=self._dictionary) if self._dictionary else zlib.compressobj(level)
+            self._blocks.append(compressor.compress(text) + compressor.flush())
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.compressed_bytes = sum(len(block) for block in self._blocks)
+        self.raw_bytes = raw_bytes
+        COMPRESSED_BYTES.set(self.compressed_bytes, bank=bank)
+        RAW_BYTES.set(raw_bytes, bank=bank)
+
+    def __len__(self):
+        return len(self._pair_ids)
+
+    def _question(self, index):
+        category, subcategory = self._pairs[self._pair_ids[index]]
+        return CompressedQuestion(self, index, category, subcategory, chr(self._answers[index]))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._question(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CompressedBank index out of range")
+        return self._question(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._question(index)
+
+    def _block(self, block_index):
+        """Return a decompressed block, decompressing it on a cache miss"""
+        with self._lock:
+            records = self._cache.get(block_index)
+            if records is not None:
+                self._cache.move_to_end(block_index)
+                BLOCK_LOOKUPS.inc(result='hit')
+                return records
+
+        BLOCK_LOOKUPS.inc(result='miss')
+        if self._dictionary:
+            decompressor = zlib.decompressobj(zdict=self._dictionary)
+        else:
+            decompressor = zlib.decompressobj()
+        text = decompressor.decompress(self._blocks[block_index]).decode('utf-8')
+        records = [tuple(record.split(FIELD_SEPARATOR)) for record in text.split(RECORD_SEPARATOR)]
+
+        with self._lock:
+            self._cache[block_index] = records
+            self._cache.move_to_end(block_index)
+            while len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+        return records
+
+    def review_key(self, index):
+        """Return the spaced-repetition key of a question without decompressing it"""
+        return self._keys[index]
+
+    def record(self, index):
+        """
+        Return (question, option1, ...) for a question
+
+        Args:
+            index (int): Question index within the bank
+
+        Returns:
+            tuple: Question text followed by its options
+        """
+        block_index, offset = divmod(index, self.block_size)
+        return self._block(block_index)[offset]
+
+    def clear_block_cache(self):
+        """Drop every decompressed block"""
+        with self._lock:
+            self._cache.clear()
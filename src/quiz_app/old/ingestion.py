@@ -0,0 +1,224 @@
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from metrics import REGISTRY
+
+ANSWERS_ENQUEUED = REGISTRY.counter('ingest_answers_enqueued_total', 'Answers accepted onto the ingestion queue')
+ANSWERS_DROPPED = REGISTRY.counter('ingest_answers_dropped_total', 'Answers rejected because the queue was full')
+ANSWERS_BLOCKED = REGISTRY.counter('ingest_submit_blocked_total', 'Submissions that had to wait for queue space')
+QUEUE_DEPTH = REGISTRY.gauge('ingest_queue_depth', 'Answers waiting on the ingestion queue')
+BATCH_SIZE = REGISTRY.histogram('ingest_batch_size', 'Answers per drained micro-batch',
+                                buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512))
+BATCH_SECONDS = REGISTRY.histogram('ingest_batch_seconds', 'Time to score, store and aggregate one batch')
+BATCH_ERRORS = REGISTRY.counter('ingest_batch_errors_total', 'Batches whose processing or storage write failed')
+
+# Overflow policies when the queue is full
+DROP = 'drop'
+BLOCK = 'block'
+
+
+class AnswerEvent:
+    """A submitted answer waiting to be scored"""
+
+    __slots__ = ('user_id', 'question', 'answer', 'response_time', 'submitted_at')
+
+    def __init__(self, user_id, question, answer, response_time=None, submitted_at=None):
+        """
+        Initialize an answer event
+
+        Args:
+            user_id (str): User who answered
+            question (LoadQuestion): Question that was answered
+            answer (str): Chosen option letter, None if unanswered
+            response_time (float, optional): Seconds taken to answer
+            submitted_at (float, optional): Unix time of the submission
+        """
+        self.user_id = user_id
+        self.question = question
+        self.answer = answer
+        self.response_time = response_time
+        self.submitted_at = time.time() if submitted_at is None else submitted_at
+
+
+class AnswerAggregates:
+    """Running per-user and per-question totals, updated one batch at a time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.user_totals = defaultdict(lambda: [0, 0])  # user -> [correct, answered]
+        self.question_totals = defaultdict(lambda: [0, 0])  # question text -> [correct, answered]
+
+    def apply(self, user_deltas, question_deltas):
+        """Merge pre-summed batch deltas under a single lock acquisition"""
+        with self._lock:
+            for user_id, (correct, answered) in user_deltas.items():
+                totals = self.user_totals[user_id]
+                totals[0] += correct
+                totals[1] += answered
+            for question, (correct, answered) in question_deltas.items():
+                totals = self.question_totals[question]
+                totals[0] += correct
+                totals[1] += answered
+
+    def user_score(self, user_id):
+        """Return (correct, answered) for a user"""
+        with self._lock:
+            return tuple(self.user_totals.get(user_id, (0, 0)))
+
+
+class AnswerPipeline:
+    """Bounded answer queue drained by a background thread in micro-batches"""
+
+    def __init__(self, log_path=None, max_queue=10000, batch_size=256, flush_interval=0.05,
+                 overflow=DROP, block_timeout=0.01):
+        """
+        Initialize the pipeline
+
+        Args:
+            log_path (str, optional): JSON-lines file each batch is appended to
+            max_queue (int): Maximum answers waiting to be processed
+            batch_size (int): Maximum answers per micro-batch
+            flush_interval (float): Seconds to wait for a batch to fill
+            overflow (str): 'drop' rejects immediately when full, 'block' waits up to block_timeout
+            block_timeout (float): Longest a 'block' submission may wait for space
+        """
+        if overflow not in (DROP, BLOCK):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.log_path = log_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.aggregates = AnswerAggregates()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background drain thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='answer-ingestion', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Drain what is queued and stop the background thread"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def depth(self):
+        """Return the number of answers waiting to be processed"""
+        return self._queue.qsize()
+
+    def submit(self, event):
+        """
+        Enqueue an answer without doing any scoring or I/O
+
+        Args:
+            event (AnswerEvent): Answer to ingest
+
+        Returns:
+            bool: True if accepted, False if dropped because of backpressure
+        """
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if self.overflow == DROP:
+                ANSWERS_DROPPED.inc()
+                return False
+            ANSWERS_BLOCKED.inc()
+            try:
+                self._queue.put(event, timeout=self.block_timeout)
+            except queue.Full:
+                ANSWERS_DROPPED.inc()
+                return False
+        ANSWERS_ENQUEUED.inc()
+        return True
+
+    def _next_batch(self):
+        """Wait for one answer, then take whatever else is ready up to batch_size"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self.process_batch(batch)
+                except Exception as e:
+                    # One bad event must not kill the thread and back the queue up for good
+                    BATCH_ERRORS.inc()
+                    print(f"⚠️  Could not process a batch of {len(batch)} answers: {e}")
+            elif self._stop.is_set():
+                break
+            QUEUE_DEPTH.set(self._queue.qsize())
+
+    def process_batch(self, batch):
+        """
+        Score, store and aggregate a batch of answers in one pass each
+
+        Args:
+            batch (list): AnswerEvent objects
+
+        Returns:
+            list: Scoring results (True/False) in batch order
+        """
+        start_time = time.perf_counter()
+        results = [event.answer is not None and event.question.check_correct(event.answer)
+                   for event in batch]
+
+        if self.log_path:
+            lines = []
+            for event, is_correct in zip(batch, results):
+                lines.append(json.dumps({
+                    'user_id': event.user_id,
+                    'category': event.question.category,
+                    'subcategory': event.question.subcategory,
+                    'question': event.question.question,
+                    'answer': event.answer,
+                    'correct': is_correct,
+                    'response_time': event.response_time,
+                    'submitted_at': event.submitted_at,
+                }))
+            try:
+                with open(self.log_path, mode='a', encoding='utf-8') as file:
+                    file.write('\n'.join(lines) + '\n')
+            except OSError as e:
+                BATCH_ERRORS.inc()
+                print(f"⚠️  Could not append {len(batch)} answers to {self.log_path}: {e}")
+
+        user_deltas = defaultdict(lambda: [0, 0])
+        question_deltas = defaultdict(lambda: [0, 0])
+        for event, is_correct in zip(batch, results):
+            user_delta = user_deltas[event.user_id]
+            question_delta = question_deltas[event.question.question]
+            user_delta[1] += 1
+            question_delta[1] += 1
+            if is_correct:
+                user_delta[0] += 1
+                question_delta[0] += 1
+        self.aggregates.apply(user_deltas, question_deltas)
+
+        BATCH_SIZE.observe(len(batch))
+        BATCH_SECONDS.observe(time.perf_counter() - start_time)
+        return results
@@ -0,0 +1,308 @@
+import itertools
+import json
+import os
+import time
+from array import array
+from metrics import REGISTRY
+from memory_report import track
+
+LEADERBOARD_UPDATES = REGISTRY.counter('leaderboard_updates_total', 'Score updates applied to leaderboards')
+LEADERBOARD_EXPIRED = REGISTRY.counter('leaderboard_windows_expired_total', 'Time-window boards dropped on rollover')
+
+SECONDS_PER_DAY = 86400
+
+# Window name -> function mapping a unix timestamp to a window id.
+# Weeks start on Monday (the unix epoch fell on a Thursday).
+WINDOWS = {
+    'all': lambda now: 0,
+    'daily': lambda now: int(now // SECONDS_PER_DAY),
+    'weekly': lambda now: int((now // SECONDS_PER_DAY + 3) // 7),
+}
+
+
+class FenwickTree:
+    """Binary indexed tree of counts supporting prefix sums and k-th lookups in O(log n)"""
+
+    def __init__(self, size):
+        self.size = size
+        self._tree = array('l', [0]) * (size + 1)
+        self._top_bit = 1 << (size.bit_length() - 1) if size else 0
+
+    def add(self, index, delta):
+        """Add delta to the count at a 0-based index"""
+        index += 1
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index):
+        """Return the sum of counts at 0-based indices [0, index]"""
+        total = 0
+        index += 1
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def find_kth(self, k):
+        """
+        Find the smallest 0-based index whose prefix sum reaches k
+
+        Args:
+            k (int): 1-based order statistic
+
+        Returns:
+            int: Bucket index holding the k-th smallest element
+        """
+        position = 0
+        step = self._top_bit
+        while step:
+            candidate = position + step
+            if candidate <= self.size and self._tree[candidate] < k:
+                position = candidate
+                k -= self._tree[candidate]
+            step >>= 1
+        return position
+
+
+class ScoreBoard:
+    """Order-statistic board of integer user scores counted in a Fenwick tree"""
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty board
+
+        Args:
+            capacity (int): Initial number of score buckets; grows by doubling
+        """
+        self._tree = FenwickTree(max(1, capacity))
+        self._scores = {}
+        # score -> {user_id: None}; dicts keep arrival order, so ties are
+        # listed first-come first-served without any sorting
+        self._members = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _grow(self, score):
+        """Rebuild the tree with room for score, doubling to keep growth amortized"""
+        size = self._tree.size
+        while size <= score:
+            size *= 2
+        tree = FenwickTree(size)
+        for bucket, members in self._members.items():
+            tree.add(bucket, len(members))
+        self._tree = tree
+
+    def score(self, user_id):
+        """Return a user's score or None if they are not on the board"""
+        return self._scores.get(user_id)
+
+    def set_score(self, user_id, score):
+        """
+        Set a user's score
+
+        Args:
+            user_id (str): User identifier
+            score (int): New score (negative scores count as 0)
+        """
+        score = max(0, int(score))
+        previous = self._scores.get(user_id)
+        if previous == score:
+            return
+        if previous is not None:
+            members = self._members[previous]
+            del members[user_id]
+            if not members:
+                del self._members[previous]
+            self._tree.add(previous, -1)
+
+        if score >= self._tree.size:
+            self._grow(score)
+        self._scores[user_id] = score
+        self._members.setdefault(score, {})[user_id] = None
+        self._tree.add(score, 1)
+
+    def add_points(self, user_id, points):
+        """Add points to a user's score and return the new total"""
+        total = self._scores.get(user_id, 0) + points
+        self.set_score(user_id, total)
+        return self._scores[user_id]
+
+    def rank(self, user_id):
+        """
+        Return a user's 1-based rank (ties share a rank) in O(log n)
+
+        Args:
+            user_id (str): User identifier
+
+        Returns:
+            int: Rank, or None if the user is not on the board
+        """
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return len(self._scores) - self._tree.prefix(score) + 1
+
+    def top(self, k):
+        """
+        Return the k highest scores
+
+        Visits one bucket per distinct score in the result and never more
+        than k members, so the cost does not depend on the size of tie groups.
+
+        Args:
+            k (int): Number of entries
+
+        Returns:
+            list: (user_id, score) tuples, best first
+        """
+        results = []
+        position = len(self._scores)
+        while position > 0 and len(results) < k:
+            score = self._tree.find_kth(position)
+            members = self._members[score]
+            for user_id in itertools.islice(members, k - len(results)):
+                results.append((user_id, score))
+            position -= len(members)
+        return results
+
+    def to_dict(self):
+        """Return {user_id: score} for persistence"""
+        return dict(self._scores)
+
+
+class Leaderboard:
+    """Global and per-category leaderboards over all-time and rolling time windows"""
+
+    def __init__(self, capacity=1024, windows=('all', 'daily', 'weekly'), clock=time.time):
+        """
+        Initialize the leaderboard
+
+        Args:
+            capacity (int): Initial score range of each board; boards grow as needed
+            windows (tuple): Window names from WINDOWS to maintain
+            clock (callable): Returns the current unix time
+        """
+        unknown = set(windows) - set(WINDOWS)
+        if unknown:
+            raise ValueError(f"Unknown leaderboard windows: {sorted(unknown)}")
+        self.capacity = capacity
+        self.windows = tuple(windows)
+        self.clock = clock
+        # (window, category) -> (window_id, ScoreBoard); category None is the global board
+        self._boards = {}
+        track('index', f'leaderboard-{id(self)}', self)
+
+    def _board(self, window, category, now, create=False):
+        if window not in self.windows:
+            raise ValueError(f"Window '{window}' is not tracked. Available: {list(self.windows)}")
+        window_id = WINDOWS[window](now)
+        key = (window, category)
+        entry = self._boards.get(key)
+        if entry is not None and entry[0] != window_id:
+            # The window rolled over: dropping the board is the whole expiry cost
+            del self._boards[key]
+            LEADERBOARD_EXPIRED.inc(window=window)
+            entry = None
+        if entry is None:
+            if not create:
+                return None
+            entry = (window_id, ScoreBoard(self.capacity))
+            self._boards[key] = entry
+        return entry[1]
+
+    def record(self, user_id, category, points, now=None):
+        """
+        Add points from a finished quiz to every board the user belongs to
+
+        Args:
+            user_id (str): User identifier
+            category (str): Quiz category
+            points (int): Points earned
+            now (float, optional): Unix time of the result
+        """
+        now = self.clock() if now is None else now
+        for window in self.windows:
+            for board_category in (None, category):
+                self._board(window, board_category, now, create=True).add_points(user_id, points)
+        LEADERBOARD_UPDATES.inc()
+
+    def top(self, k=10, category=None, window='all', now=None):
+        """
+        Return the top k entries of a board
+
+        Args:
+            k (int): Number of entries
+            category (str, optional): Category board, or the global board if None
+            window (str): 'all', 'daily' or 'weekly'
+            now (float, optional): Unix time used to select the window
+
+        Returns:
+            list: (user_id, score) tuples, best first
+        """
+        board = self._board(window, category, self.clock() if now is None else now)
+        return board.top(k) if board else []
+
+    def rank(self, user_id, category=None, window='all', now=None):
+        """
+        Return a user's rank and score on a board
+
+        Args:
+            user_id (str): User identifier
+            category (str, optional): Category board, or the global board if None
+            window (str): 'all', 'daily' or 'weekly'
+            now (float, optional): Unix time used to select the window
+
+        Returns:
+            tuple: (rank, score, players) or None if the user is not ranked
+        """
+        board = self._board(window, category, self.clock() if now is None else now)
+        if board is None:
+            return None
+        rank = board.rank(user_id)
+        if rank is None:
+            return None
+        return rank, board.score(user_id), len(board)
+
+    def save(self, file_path):
+        """
+        Write every board to a JSON file, replacing it atomically
+
+        Args:
+            file_path (str): Destination path
+        """
+        boards = [
+            {'window': window, 'category': category, 'window_id': window_id, 'scores': board.to_dict()}
+            for (window, category), (window_id, board) in self._boards.items()
+        ]
+        temp_path = f'{file_path}.tmp'
+        with open(temp_path, mode='w', encoding='utf-8') as file:
+            json.dump({'boards': boards}, file)
+        os.replace(temp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path, **kwargs):
+        """
+        Rebuild a leaderboard written by save()
+
+        Boards whose window has since rolled over are dropped on first access.
+
+        Args:
+            file_path (str): Path written by save()
+            **kwargs: Passed to the constructor
+
+        Returns:
+            Leaderboard: Restored leaderboard
+        """
+        leaderboard = cls(**kwargs)
+        with open(file_path, mode='r', encoding='utf-8') as file:
+            data = json.load(file)
+        for entry in data.get('boards', []):
+            if entry['window'] not in leaderboard.windows:
+                continue
+            board = ScoreBoard(leaderboard.capacity)
+            for user_id, score in entry['scores'].items():
+                board.set_score(user_id, score)
+            leaderboard._boards[(entry['window'], entry['category'])] = (entry['window_id'], board)
+        return leaderboard
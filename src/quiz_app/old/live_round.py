@@ -0,0 +1,255 @@
+import json
+import threading
+import time
+import uuid
+from metrics import REGISTRY
+from memory_report import track
+
+FANOUT_SECONDS = REGISTRY.histogram('live_fanout_seconds', 'Time to deliver one question to every participant')
+FANOUT_FAILURES = REGISTRY.counter('live_fanout_failures_total', 'Question deliveries that raised')
+PAYLOAD_BYTES = REGISTRY.histogram('live_payload_bytes', 'Serialized question payload size',
+                                   buckets=(256, 512, 1024, 2048, 4096, 8192, 16384))
+SUBMISSIONS = REGISTRY.counter('live_submissions_total', 'Live round answer submissions by result')
+ROUNDS = REGISTRY.counter('live_rounds_total', 'Live rounds closed')
+
+
+def serialize_question(question, round_id, deadline):
+    """
+    Serialize a question for participants once per round (the answer is withheld)
+
+    Args:
+        question (LoadQuestion): Question to send
+        round_id (str): Round identifier
+        deadline (float): Unix time at which the round closes
+
+    Returns:
+        bytes: UTF-8 JSON payload
+    """
+    return json.dumps({
+        'round_id': round_id,
+        'category': question.category,
+        'subcategory': question.subcategory,
+        'question': question.question,
+        'options': {chr(65 + i): option for i, option in enumerate(question.options)},
+        'deadline': deadline,
+    }, separators=(',', ':')).encode('utf-8')
+
+
+class RoundResult:
+    """Answer distribution of a closed round"""
+
+    def __init__(self, round_id, correct_answer, distribution, participants):
+        self.round_id = round_id
+        self.correct_answer = correct_answer
+        self.distribution = distribution
+        self.participants = participants
+        self.answered = sum(distribution.values())
+        self.correct = distribution.get(correct_answer, 0)
+
+    @property
+    def unanswered(self):
+        return max(0, self.participants - self.answered)
+
+    def __repr__(self):
+        return (f"RoundResult(round_id='{self.round_id}', correct={self.correct}/{self.participants}, "
+                f"distribution={self.distribution})")
+
+
+class LiveRound:
+    """One question broadcast to many players and closed on a shared deadline"""
+
+    def __init__(self, question, duration, round_id=None):
+        """
+        Initialize a round
+
+        Args:
+            question (LoadQuestion): Question for this round
+            duration (float): Seconds participants have to answer
+            round_id (str, optional): Identifier, generated if omitted
+        """
+        self.question = question
+        self.duration = duration
+        self.round_id = round_id or uuid.uuid4().hex
+        self.options = question.get_valid_options()
+        self.result = None
+        self.deadline = None
+        self._deadline_monotonic = None
+        self.participants = 0
+        self._players = frozenset()
+        # Submitters only touch this dict (setdefault is atomic under the GIL),
+        # so the hot path never takes a lock; close() tallies a snapshot of it
+        self._answers = {}
+        self._final_answers = None
+        self._closed = threading.Event()
+        self._timer = None
+        self._close_lock = threading.Lock()
+        self._callbacks = []
+
+    def on_close(self, callback):
+        """Register callback(result) to run the moment the round closes"""
+        self._callbacks.append(callback)
+
+    def open(self, participants):
+        """
+        Serialize the question once, fan it out and start the shared deadline
+
+        Args:
+            participants (dict): Mapping of player id to a send(payload) callable
+
+        Returns:
+            bytes: The payload that was delivered
+        """
+        self._players = frozenset(participants)
+        self.participants = len(self._players)
+        self.deadline = time.time() + self.duration
+        self._deadline_monotonic = time.monotonic() + self.duration
+        self._timer = threading.Timer(self.duration, self.close)
+        self._timer.daemon = True
+        self._timer.start()
+
+        payload = serialize_question(self.question, self.round_id, self.deadline)
+        PAYLOAD_BYTES.observe(len(payload))
+        with FANOUT_SECONDS.time():
+            for send in participants.values():
+                try:
+                    send(payload)
+                except Exception:
+                    FANOUT_FAILURES.inc()
+        return payload
+
+    def submit(self, player_id, answer):
+        """
+        Record a player's answer; the first answer per player counts
+
+        Args:
+            player_id (str): Player identifier
+            answer (str): Option letter or number
+
+        Returns:
+            bool: True if the answer was accepted
+        """
+        if self._deadline_monotonic is None:
+            SUBMISSIONS.inc(result='not_open')
+            return False
+        if player_id not in self._players:
+            SUBMISSIONS.inc(result='unknown_player')
+            return False
+        if self._closed.is_set() or time.monotonic() > self._deadline_monotonic:
+            SUBMISSIONS.inc(result='late')
+            return False
+        option = self.question._normalize_answer(str(answer))
+        if option not in self.options:
+            SUBMISSIONS.inc(result='invalid')
+            return False
+        entry = (option,)
+        # dict.setdefault is atomic: only the first submission per player wins
+        if self._answers.setdefault(player_id, entry) is not entry:
+            SUBMISSIONS.inc(result='duplicate')
+            return False
+        if self._closed.is_set():
+            # close() ran after the check above; the answer counts only if it
+            # landed before the snapshot, which is final once the lock is free
+            with self._close_lock:
+                counted = self._final_answers.get(player_id) is entry
+            if not counted:
+                SUBMISSIONS.inc(result='late')
+                return False
+        SUBMISSIONS.inc(result='accepted')
+        return True
+
+    def close(self):
+        """
+        Close the round and publish the result (idempotent)
+
+        Returns:
+            RoundResult: Final answer distribution
+        """
+        with self._close_lock:
+            if self.result is not None:
+                return self.result
+            self._closed.set()
+            if self._timer is not None:
+                self._timer.cancel()
+            # Result and correct_players() both come from this one snapshot
+            self._final_answers = dict(self._answers)
+            distribution = dict.fromkeys(self.options, 0)
+            for option, in self._final_answers.values():
+                distribution[option] += 1
+            self.result = RoundResult(self.round_id, self.question.answer, distribution, self.participants)
+            ROUNDS.inc()
+
+        for callback in self._callbacks:
+            callback(self.result)
+        return self.result
+
+    def wait(self, timeout=None):
+        """Block until the round closes and return its result"""
+        self._closed.wait(timeout)
+        with self._close_lock:
+            return self.result
+
+    def correct_players(self):
+        """Return the players whose counted answer matched the correct option"""
+        correct = self.question.answer
+        answers = self._answers if self._final_answers is None else self._final_answers
+        return [player_id for player_id, (option,) in answers.items() if option == correct]
+
+
+class LiveSession:
+    """Host-driven sequence of live rounds over a fixed set of participants"""
+
+    def __init__(self, participants, time_limit=30, leaderboard=None, category=None):
+        """
+        Initialize a session
+
+        Args:
+            participants (dict): Mapping of player id to a send(payload) callable
+            time_limit (float): Seconds per round
+            leaderboard (Leaderboard, optional): Receives final scores when the session ends
+            category (str, optional): Leaderboard category for the session
+        """
+        self.participants = participants
+        self.time_limit = time_limit
+        self.leaderboard = leaderboard
+        self.category = category
+        self.scores = dict.fromkeys(participants, 0)
+        self.results = []
+        self.current = None
+        track('session', f'live-{id(self)}', self)
+
+    def run_round(self, question):
+        """
+        Broadcast a question, wait for its deadline and tally the round
+
+        Args:
+            question (LoadQuestion): Question for this round
+
+        Returns:
+            RoundResult: Distribution of the round
+        """
+        live_round = LiveRound(question, self.time_limit)
+        self.current = live_round
+        live_round.open(self.participants)
+        result = live_round.wait()
+        for player_id in live_round.correct_players():
+            self.scores[player_id] = self.scores.get(player_id, 0) + 1
+        self.results.append(result)
+        return result
+
+    def submit(self, player_id, answer):
+        """Forward an answer to the round in progress"""
+        if self.current is None:
+            return False
+        return self.current.submit(player_id, answer)
+
+    def finish(self):
+        """
+        Record final scores on the leaderboard
+
+        Returns:
+            list: (player_id, score) tuples, best first
+        """
+        if self.leaderboard is not None and self.category is not None:
+            for player_id, score in self.scores.items():
+                self.leaderboard.record(player_id, self.category, score)
+        return sorted(self.scores.items(), key=lambda item: (-item[1], item[0]))
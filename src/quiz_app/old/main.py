@@ -1,8 +1,26 @@
 from quiz_loader import QuizLoader
 from quiz import Quiz
+from metrics import REGISTRY, profile
+from leaderboard import Leaderboard
+from spaced_repetition import ReviewScheduler
+from ingestion import AnswerPipeline
+from adaptive import ItemCalibration
+from admission import AdmissionController
+from bank_lint import lint_all, format_finding
+import memory_report
+import argparse
+import contextlib
+import getpass
+import json
 import os
+import struct
+import sys
 from pathlib import Path
 
+# Repository root (src/quiz_app/old is three directories below it)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+DATA_DIR = PROJECT_ROOT / "resources/data"
+
 def get_subject_choice():
     """Get user's subject choice with proper validation"""
     # Get the project root directory (2 levels up from this file)
@@ -56,7 +74,145 @@ def validate_file_path(file_path):
     
     return True
 
-def main():
+def start_metrics_export():
+    """Start the opt-in metrics endpoint configured through QUIZ_METRICS_PORT"""
+    port = os.environ.get('QUIZ_METRICS_PORT')
+    if not port:
+        return None
+    try:
+        server = REGISTRY.start_http_server(int(port))
+        print(f'📈 Metrics available at http://127.0.0.1:{server.server_address[1]}/metrics')
+        return server
+    except (ValueError, OSError) as e:
+        print(f'⚠️  Could not start metrics endpoint: {e}')
+        return None
+
+def dump_metrics():
+    """Write metrics to QUIZ_METRICS_FILE if it is set"""
+    metrics_file = os.environ.get('QUIZ_METRICS_FILE')
+    if not metrics_file:
+        return
+    try:
+        REGISTRY.dump(metrics_file)
+    except OSError as e:
+        print(f'⚠️  Could not write metrics to {metrics_file}: {e}')
+
+def load_review_scheduler():
+    """Load the spaced-repetition state named by QUIZ_REVIEW_STATE, if review mode is on"""
+    state_file = os.environ.get('QUIZ_REVIEW_STATE')
+    if not state_file:
+        return None, None
+    if os.path.exists(state_file):
+        try:
+            return ReviewScheduler.load(state_file), state_file
+        except (OSError, ValueError, UnicodeDecodeError, struct.error) as e:
+            print(f'⚠️  Could not load review state from {state_file}: {e}')
+    return ReviewScheduler(), state_file
+
+def load_leaderboard():
+    """Load the shared leaderboard named by QUIZ_LEADERBOARD_STATE, if standings are on"""
+    state_file = os.environ.get('QUIZ_LEADERBOARD_STATE')
+    if not state_file:
+        return None, None
+    if os.path.exists(state_file):
+        try:
+            return Leaderboard.load(state_file), state_file
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f'⚠️  Could not load leaderboard from {state_file}: {e}')
+    return Leaderboard(), state_file
+
+def parse_args(argv=None):
+    """Parse command line arguments; no subcommand starts the interactive quiz"""
+    parser = argparse.ArgumentParser(prog='quiz-app', description='Timer-based quiz application')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    lint_parser = subparsers.add_parser('lint', help='Check question banks and the manifest')
+    lint_parser.add_argument('--data-dir', default=str(DATA_DIR), help='resources/data directory to check')
+    lint_parser.add_argument('--cache', default=str(PROJECT_ROOT / '.quiz_lint_cache.json'),
+                             help='Findings cache keyed by content hash (empty string disables)')
+    lint_parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    lint_parser.add_argument('--format', choices=['text', 'json'], default='text',
+                             help='json emits one finding per line')
+    lint_parser.add_argument('--strict', action='store_true', help='Fail on warnings as well as errors')
+    
+    memory_parser = subparsers.add_parser('memory', help='Report resident memory per bank')
+    memory_parser.add_argument('banks', nargs='*', help='Bank CSV files (default: every bank)')
+    memory_parser.add_argument('--budget', type=float, default=None,
+                               help='Fail if any bank exceeds this many bytes per question')
+    memory_parser.add_argument('--format', choices=['text', 'json'], default='text')
+    
+    return parser.parse_args(argv)
+
+def run_lint(args):
+    """Run the bank linter and return the process exit code"""
+    findings, stats = lint_all(args.data_dir, PROJECT_ROOT, cache_path=args.cache or None, jobs=args.jobs)
+    
+    if args.format == 'json':
+        for finding in findings:
+            print(json.dumps(finding))
+    else:
+        for finding in findings:
+            print(format_finding(finding))
+        print(f"\n🔎 Checked {stats['banks']} banks ({stats['rechecked']} re-checked) in {stats['seconds']:.2f}s: "
+              f"{stats['errors']} errors, {stats['warnings']} warnings")
+    
+    if stats['errors'] or (args.strict and stats['warnings']):
+        return 1
+    return 0
+
+def run_memory_report(args):
+    """Load banks, attribute their memory and return the process exit code"""
+    banks = args.banks or sorted(str(path) for path in (DATA_DIR / 'quizzes').rglob('*.csv'))
+    loads = []
+    # The loader's per-row diagnostics are not useful here
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for file_path in banks:
+            loads.append(memory_report.measure_load(file_path))
+    # Persisted indexes are loaded so they are attributed alongside the banks;
+    # live sessions only exist in a running quiz, see the metrics endpoint
+    scheduler, _ = load_review_scheduler()
+    leaderboard, _ = load_leaderboard()
+    report = memory_report.build_report()
+    report['loads'] = loads
+    over_budget = memory_report.check_budget(report, args.budget) if args.budget is not None else []
+    
+    if args.format == 'json':
+        report['over_budget'] = [bank['file_path'] for bank in over_budget]
+        print(json.dumps(report, indent=2))
+    else:
+        print(memory_report.format_report(report))
+        for load in loads:
+            print(f"   {Path(load['file_path']).name}: {load['allocated_bytes'] / 1024:.1f} KB allocated by load "
+                  f"(peak {load['peak_bytes'] / 1024:.1f} KB)")
+        for bank in over_budget:
+            print(f"❌ {Path(bank['file_path']).name} uses {bank['bytes_per_question']:.0f} bytes per question "
+                  f"(budget {args.budget:.0f})")
+    
+    dump_metrics()
+    return 1 if over_budget else 0
+
+def load_calibration():
+    """Calibrate items from the answer log named by QUIZ_CALIBRATION_LOG, enabling adaptive mode"""
+    log_path = os.environ.get('QUIZ_CALIBRATION_LOG')
+    if not log_path:
+        return None
+    calibration = ItemCalibration()
+    try:
+        calibration.calibrate_from_log(log_path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f'⚠️  Could not calibrate from {log_path}: {e}')
+        return None
+    print(f'📐 Adaptive mode: {len(calibration.parameters)} calibrated questions')
+    return calibration
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'lint':
+        return run_lint(args)
+    if args.command == 'memory':
+        return run_memory_report(args)
+    
+    start_metrics_export()
     try:
         # Get subject choice
         file_path = get_subject_choice()
@@ -80,7 +236,10 @@ def main():
         
         # Load questions
         print('\n📚 Loading questions...')
-        questions = QuizLoader.load_questions(file_path)
+        if os.environ.get('QUIZ_COMPRESSED_BANKS'):
+            questions = QuizLoader.load_compressed(file_path)
+        else:
+            questions = QuizLoader.load_questions(file_path)
         
         if not questions:
             print('No questions were loaded! Please check the CSV file format.')
@@ -99,8 +258,22 @@ def main():
             except ValueError:
                 print('Please enter a valid number!')
         
-        quiz = Quiz(questions, time_limit=time_limit)
-        quiz.conduct()
+        scheduler, review_state_file = load_review_scheduler()
+        leaderboard, leaderboard_state_file = load_leaderboard()
+        answer_log = os.environ.get('QUIZ_ANSWER_LOG')
+        pipeline = AnswerPipeline(log_path=answer_log).start() if answer_log else None
+        quiz = Quiz(questions, time_limit=time_limit,
+                    user_id=getpass.getuser(), leaderboard=leaderboard, scheduler=scheduler,
+                    pipeline=pipeline, calibration=load_calibration(),
+                    admission=AdmissionController(queue_depth=pipeline.depth if pipeline else None))
+        with profile(os.environ.get('QUIZ_PROFILE_OUTPUT')):
+            quiz.conduct()
+        if pipeline is not None:
+            pipeline.stop()
+        if scheduler is not None:
+            scheduler.save(review_state_file)
+        if leaderboard is not None:
+            leaderboard.save(leaderboard_state_file)
         QuizLoader.clear_cache()
         
         
@@ -109,6 +282,8 @@ def main():
     except Exception as e:
         print(f'An unexpected error occurred: {e}')
         print('Please contact support if this issue persists.')
+    finally:
+        dump_metrics()
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
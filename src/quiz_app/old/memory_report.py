@@ -0,0 +1,204 @@
+import gc
+import os
+import sys
+import tracemalloc
+import weakref
+from array import array
+from quiz_loader import QuizLoader
+from metrics import REGISTRY
+
+BANK_BYTES = REGISTRY.gauge('memory_bank_bytes', 'Deep size of a cached question bank')
+BANK_BYTES_PER_QUESTION = REGISTRY.gauge('memory_bank_bytes_per_question', 'Deep size per cached question')
+TRACKED_BYTES = REGISTRY.gauge('memory_tracked_bytes', 'Deep size of tracked indexes and sessions by kind')
+LOAD_ALLOCATED_BYTES = REGISTRY.gauge('memory_load_allocated_bytes',
+                                      'Bytes still allocated after loading a bank (tracemalloc)')
+
+# Weak references to live objects worth attributing, grouped by kind
+_tracked = {}
+
+
+def track(kind, name, obj):
+    """
+    Register an object for memory attribution without keeping it alive
+
+    Args:
+        kind (str): Group such as 'index' or 'session'
+        name (str): Label shown in the report
+        obj (object): Object to measure; must support weak references
+    """
+    _tracked.setdefault(kind, {})[name] = weakref.ref(obj)
+
+
+def tracked(kind):
+    """Return {name: object} for the live objects of a kind"""
+    group = _tracked.get(kind, {})
+    live = {}
+    for name, ref in list(group.items()):
+        obj = ref()
+        if obj is None:
+            del group[name]
+        else:
+            live[name] = obj
+    return live
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Approximate the resident bytes reachable from an object
+
+    Walks containers, instance dicts and slots with sys.getsizeof, counting
+    each object once. Modules, classes and functions are not followed.
+
+    Args:
+        obj (object): Root object
+        seen (set, optional): ids already counted, shared across calls
+
+    Returns:
+        int: Size in bytes
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        if isinstance(current, (type, type(sys), type(deep_sizeof))):
+            continue
+        seen.add(id(current))
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, array, memoryview)) or current is None:
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            attributes = getattr(current, '__dict__', None)
+            if attributes is not None:
+                stack.append(attributes)
+            for cls in type(current).__mro__:
+                for slot in cls.__dict__.get('__slots__', ()):
+                    value = getattr(current, slot, None)
+                    if value is not None:
+                        stack.append(value)
+    return total
+
+
+def measure_load(file_path):
+    """
+    Load a bank through QuizLoader and attribute the allocations to it
+
+    Uses tracemalloc snapshots taken around the load; the bank must not
+    already be cached.
+
+    Args:
+        file_path (str): Path to the CSV bank
+
+    Returns:
+        dict: Loaded question count, allocated bytes and peak bytes
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    questions = QuizLoader.load_questions(file_path)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    if not was_tracing:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    LOAD_ALLOCATED_BYTES.set(allocated, bank=os.path.basename(file_path))
+    return {
+        'file_path': file_path,
+        'questions': len(questions),
+        'allocated_bytes': allocated,
+        'peak_bytes': peak,
+    }
+
+
+def build_report():
+    """
+    Attribute resident bytes to cached banks and tracked objects
+
+    Objects are counted once: indexes and sessions are only charged for
+    memory not already attributed to a bank.
+
+    Returns:
+        dict: {'banks': [...], 'tracked': {kind: [...]}, 'total_bytes': int}
+    """
+    seen = set()
+    banks = []
+    for file_path, questions in list(QuizLoader._cache.items()):
+        size = deep_sizeof(questions, seen)
+        count = len(questions)
+        per_question = size / count if count else 0
+        bank = os.path.basename(file_path)
+        BANK_BYTES.set(size, bank=bank)
+        BANK_BYTES_PER_QUESTION.set(round(per_question, 1), bank=bank)
+        banks.append({
+            'file_path': file_path,
+            'questions': count,
+            'bytes': size,
+            'bytes_per_question': per_question,
+        })
+
+    groups = {}
+    # Indexes before sessions, so a session is not charged for the indexes it uses
+    for kind in sorted(_tracked, key=lambda kind: (kind != 'index', kind != 'session', kind)):
+        entries = []
+        for name, obj in tracked(kind).items():
+            entries.append({'name': name, 'bytes': deep_sizeof(obj, seen)})
+        TRACKED_BYTES.set(sum(entry['bytes'] for entry in entries), kind=kind)
+        groups[kind] = entries
+
+    total = sum(bank['bytes'] for bank in banks)
+    total += sum(entry['bytes'] for entries in groups.values() for entry in entries)
+    return {'banks': banks, 'tracked': groups, 'total_bytes': total}
+
+
+def collect_gauges():
+    """Refresh the memory_* gauges; registered as a metrics collector"""
+    # Start from empty series so evicted banks and collected objects drop out
+    for gauge in (BANK_BYTES, BANK_BYTES_PER_QUESTION, TRACKED_BYTES):
+        gauge.reset()
+    build_report()
+
+
+REGISTRY.add_collector(collect_gauges)
+
+
+def check_budget(report, bytes_per_question):
+    """
+    Find banks over a bytes-per-question budget
+
+    Args:
+        report (dict): Output of build_report()
+        bytes_per_question (float): Allowed deep size per question
+
+    Returns:
+        list: Banks exceeding the budget
+    """
+    return [bank for bank in report['banks'] if bank['bytes_per_question'] > bytes_per_question]
+
+
+def format_report(report):
+    """Render a report as console text"""
+    lines = ['🧠 Memory Attribution']
+    for bank in report['banks']:
+        lines.append(f"   {os.path.basename(bank['file_path'])}: {bank['bytes'] / 1024:.1f} KB "
+                     f"({bank['questions']} questions, {bank['bytes_per_question']:.0f} B/question)")
+    for kind, entries in report['tracked'].items():
+        for entry in entries:
+            lines.append(f"   {kind} {entry['name']}: {entry['bytes'] / 1024:.1f} KB")
+    lines.append(f"   Total attributed: {report['total_bytes'] / (1024 * 1024):.2f} MB")
+    return '\n'.join(lines)
@@ -0,0 +1,389 @@
+import bisect
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter as _TallyCounter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Default latency buckets in seconds (upper bounds, +Inf is implicit)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    """Turn a labels dict into a hashable, ordered key"""
+    if not labels:
+        return ()
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    """Render a label key in text exposition format"""
+    pairs = list(key)
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+class _Metric:
+    """Base class for a named metric with optional labels"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, help_text=''):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def render(self):
+        """Render the metric in text exposition format"""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f'{self.name}{_format_labels(key)} {value}')
+        return lines
+
+    def value(self, **labels):
+        """Return the current value for the given labels"""
+        return self._values.get(_label_key(labels), 0)
+
+    def reset(self):
+        """Drop all recorded values"""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """
+        Increment the counter
+
+        Args:
+            amount (int|float): Amount to add (must be non-negative)
+            **labels: Label values identifying the series
+        """
+        if amount < 0:
+            raise ValueError("Counter can only be incremented by a non-negative amount")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        """Set the gauge to an absolute value"""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        """Add to the gauge"""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        """Subtract from the gauge"""
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; observing is a bisect plus two additions"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text='', buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """
+        Record a single observation
+
+        Args:
+            value (float): Observed value
+            **labels: Label values identifying the series
+        """
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), sum, count
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[key] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall time of its block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def value(self, **labels):
+        """Return (count, sum) for the given labels"""
+        series = self._values.get(_label_key(labels))
+        if series is None:
+            return 0, 0.0
+        return series[2], series[1]
+
+    def render(self):
+        """Render cumulative buckets, sum and count"""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted((key, ([*series[0]], series[1], series[2]))
+                           for key, series in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_format_labels(key, ("le", bound))} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{_format_labels(key, ("le", "+Inf"))} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics with text-format exposition"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text=''):
+        """Get or create a counter"""
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text=''):
+        """Get or create a gauge"""
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text='', buckets=DEFAULT_BUCKETS):
+        """Get or create a fixed-bucket histogram"""
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def get(self, name):
+        """Return a registered metric or None"""
+        return self._metrics.get(name)
+
+    def add_collector(self, collector):
+        """
+        Register a callable that refreshes gauges right before each render
+
+        Args:
+            collector (callable): Called with no arguments; errors are reported, not raised
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self):
+        """Run every registered collector"""
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"⚠️  Metrics collector {getattr(collector, '__name__', collector)} failed: {e}",
+                      file=sys.stderr)
+
+    def reset(self):
+        """Clear the values of every registered metric"""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render_text(self):
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text
+        """
+        self.collect()
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, file_path):
+        """
+        Write the current exposition text to a file atomically
+
+        Args:
+            file_path (str): Destination path
+        """
+        tmp_path = f'{file_path}.tmp'
+        with open(tmp_path, mode='w', encoding='utf-8') as file:
+            file.write(self.render_text())
+        os.replace(tmp_path, file_path)
+
+    def start_http_server(self, port, host='127.0.0.1'):
+        """
+        Serve the exposition text on a local HTTP endpoint from a daemon thread
+
+        Args:
+            port (int): Port to listen on (0 picks a free port)
+            host (str): Interface to bind, loopback by default
+
+        Returns:
+            ThreadingHTTPServer: The running server (call shutdown() to stop)
+        """
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep the quiz console clean
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
+
+
+# Process-wide registry used by the loader and quiz
+REGISTRY = MetricsRegistry()
+
+
+class SamplingProfiler:
+    """Low-overhead wall-clock sampler of a single thread's current stack"""
+
+    def __init__(self, interval=0.005, thread_id=None):
+        """
+        Initialize the sampler
+
+        Args:
+            interval (float): Seconds between samples
+            thread_id (int, optional): Thread to sample, defaults to the caller's
+        """
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples = _TallyCounter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            code = frame.f_code
+            self.samples[f'{code.co_filename}:{code.co_name}:{frame.f_lineno}'] += 1
+
+    def start(self):
+        """Start sampling in a daemon thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def report(self, limit=20):
+        """Return the hottest sampled locations as text"""
+        total = sum(self.samples.values()) or 1
+        lines = [f'{count:8d} {count / total * 100:5.1f}%  {location}'
+                 for location, count in self.samples.most_common(limit)]
+        return '\n'.join(lines)
+
+
+@contextmanager
+def profile(output_path=None, mode=None):
+    """
+    Opt-in profiling hook around a block of code
+
+    The mode defaults to the QUIZ_PROFILE environment variable; when it is
+    unset or not a known mode the block runs unprofiled.
+
+    Args:
+        output_path (str, optional): File for the report (pstats dump for cProfile)
+        mode (str, optional): 'cprofile' or 'sample'
+    """
+    mode = (mode or os.environ.get('QUIZ_PROFILE', '')).lower()
+    if mode in ('', '0', 'off'):
+        yield
+        return
+    if mode not in ('cprofile', 'sample'):
+        print(f"⚠️  Unknown profiling mode '{mode}' (expected 'cprofile' or 'sample'); running unprofiled",
+              file=sys.stderr)
+        yield
+        return
+
+    if mode == 'sample':
+        sampler = SamplingProfiler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            report = sampler.report()
+            if output_path:
+                with open(output_path, mode='w', encoding='utf-8') as file:
+                    file.write(report + '\n')
+            else:
+                print(report)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if output_path:
+            profiler.dump_stats(output_path)
+        else:
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(20)
+            print(stream.getvalue())
@@ -1,3 +1,26 @@
+import zlib
+
+
+def question_key(question):
+    """
+    Return a stable 32-bit key for a question
+
+    Banks that keep text out of memory expose a precomputed review_key, so
+    the key never forces the text to be loaded.
+
+    Args:
+        question (LoadQuestion): Question to identify
+
+    Returns:
+        int: CRC32 of the category, subcategory and question text
+    """
+    key = getattr(question, 'review_key', None)
+    if key is not None:
+        return key
+    text = f'{question.category}\x1f{question.subcategory}\x1f{question.question}'
+    return zlib.crc32(text.encode('utf-8'))
+
+
 class LoadQuestion:
     """Represents a quiz question with multiple choice options"""
     
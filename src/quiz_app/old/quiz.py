@@ -2,22 +2,54 @@ import time
 import threading
 import random
 from collections import defaultdict
+from metrics import REGISTRY
+from spaced_repetition import grade_answer
+from ingestion import AnswerEvent
+from memory_report import track
+from adaptive import AdaptiveSession
+from admission import AdmissionRejected
+
+FILTER_SECONDS = REGISTRY.histogram('quiz_filter_seconds', 'Time spent filtering questions by subcategory')
+SAMPLE_SECONDS = REGISTRY.histogram('quiz_sample_seconds', 'Time spent shuffling and sampling questions')
+ANSWER_SECONDS = REGISTRY.histogram('quiz_answer_seconds', 'Question display to processed answer round-trip')
+ANSWERS = REGISTRY.counter('quiz_answers_total', 'Answers processed by outcome')
+TIMER_DRIFT_SECONDS = REGISTRY.histogram(
+    'quiz_timer_drift_seconds', 'Lateness of the question timer beyond its limit',
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
 
 class Quiz:
     """Main quiz conductor class with timer functionality"""
     
-    def __init__(self, questions, time_limit=30):
+    def __init__(self, questions, time_limit=30, user_id=None, leaderboard=None, scheduler=None,
+                 pipeline=None, calibration=None, admission=None):
         """
         Initialize quiz with questions and time limit
         
         Args:
             questions (list): List of LoadQuestion objects
             time_limit (int): Time limit per question in seconds
+            user_id (str, optional): Player identifier used for rankings
+            leaderboard (Leaderboard, optional): Leaderboard to record results on
+            scheduler (ReviewScheduler, optional): Enables spaced-repetition review mode
+            pipeline (AnswerPipeline, optional): Receives answers for batched logging and aggregation
+            calibration (ItemCalibration, optional): Enables adaptive testing with calibrated items
+            admission (AdmissionController, optional): Rate limits session starts and answers
         """
         self.questions = questions
         self.time_limit = max(10, min(60, time_limit))  # Clamp between 10-60 seconds
         self.score = 0
         self.total_questions = 0
+        self.user_id = user_id
+        self.leaderboard = leaderboard
+        self.scheduler = scheduler
+        self.pipeline = pipeline
+        self.calibration = calibration
+        self.admission = admission
+        self.ability = None
+        self.last_answer = None
+        self.last_response_time = None
+        self.last_admitted = True
+        track('session', f'quiz-{id(self)}', self)
         
     def get_categories_and_subcategories(self):
         """Get organized categories and subcategories"""
@@ -41,8 +73,9 @@ class Quiz:
         Returns:
             list: Filtered questions
         """
-        return [q for q in self.questions 
-                if q.category == category and q.subcategory == subcategory]
+        with FILTER_SECONDS.time():
+            return [q for q in self.questions 
+                    if q.category == category and q.subcategory == subcategory]
     
     def select_option(self, prompt, options):
         """
@@ -127,6 +160,8 @@ class Quiz:
         Returns:
             bool: True if answered correctly, False otherwise
         """
+        round_trip_start = time.perf_counter()
+        
         print(f'\n{"="*60}')
         print(f'Question {question_number}/{total_questions}')
         print(f'Time limit: {self.time_limit} seconds')
@@ -152,7 +187,9 @@ class Quiz:
         
         def timer_function():
             """Timer that runs in separate thread"""
+            timer_start = time.perf_counter()
             time.sleep(self.time_limit)
+            TIMER_DRIFT_SECONDS.observe(max(0.0, time.perf_counter() - timer_start - self.time_limit))
             if not answer_received.is_set():
                 print(f'\n⏰ Time\'s up! ({self.time_limit} seconds)')
                 answer_received.set()
@@ -165,6 +202,9 @@ class Quiz:
         print(f'Enter your answer ({valid_options_str}): ', end='', flush=True)
         
         start_time = time.time()
+        self.last_answer = None
+        self.last_response_time = None
+        self.last_admitted = True
         
         # Simplified input handling for cross-platform compatibility
         try:
@@ -174,6 +214,8 @@ class Quiz:
                     user_answer[0] = user_input
                     answer_received.set()
                     elapsed_time = time.time() - start_time
+                    self.last_answer = user_input
+                    self.last_response_time = elapsed_time
                     print(f'Answer submitted in {elapsed_time:.1f} seconds')
                 else:
                     print(f'Invalid option! Valid options are: {valid_options_str}')
@@ -188,10 +230,23 @@ class Quiz:
         # Wait for timer thread to complete
         timer_thread.join(timeout=0.1)
         
+        # Admit the answer before scoring it, so a shed answer is never graded
+        rejection = None
+        if user_answer[0] and self.admission is not None:
+            try:
+                self.admission.admit_answer(self.user_id)
+            except AdmissionRejected as e:
+                rejection = e
+                self.last_admitted = False
+        
         # Process answer
         is_correct = False
-        if user_answer[0]:
+        if rejection is not None:
+            outcome = 'rejected'
+            print(f'⏳ {rejection}. This question is not scored.')
+        elif user_answer[0]:
             is_correct = question.check_correct(user_answer[0])
+            outcome = 'correct' if is_correct else 'incorrect'
             user_option_text = question.get_user_answer_text(user_answer[0])
             
             if is_correct:
@@ -201,10 +256,14 @@ class Quiz:
                 print(f'❌ Incorrect! You chose: {user_answer[0]}. {user_option_text}')
                 print(f'   Correct answer: {question.answer}. {correct_text}')
         else:
+            outcome = 'unanswered'
             correct_text = question.get_correct_option_text()
             print(f'⏰ No answer provided!')
             print(f'   Correct answer: {question.answer}. {correct_text}')
         
+        ANSWERS.inc(outcome=outcome)
+        ANSWER_SECONDS.observe(time.perf_counter() - round_trip_start, outcome=outcome)
+        
         return is_correct
     
     def display_final_results(self):
@@ -232,8 +291,99 @@ class Quiz:
         print(f'\nThank you for taking the quiz!')
         print("="*60)
     
+    def record_leaderboard_result(self, category):
+        """
+        Record the final score on the leaderboard and show the player's standing
+        
+        Args:
+            category (str): Category the quiz was taken in
+        """
+        if self.leaderboard is None or self.user_id is None:
+            return
+        
+        self.leaderboard.record(self.user_id, category, self.score)
+        
+        print('\n🏅 Leaderboard')
+        for label, board_category in (('Overall', None), (category, category)):
+            standing = self.leaderboard.rank(self.user_id, category=board_category)
+            if standing:
+                rank, points, players = standing
+                print(f'   {label}: #{rank} of {players} ({points} points)')
+    
+    def record_answer(self, question, is_correct):
+        """
+        Update score and hand the answer to the optional review and ingestion hooks
+        
+        Args:
+            question (LoadQuestion): Question that was just asked
+            is_correct (bool): Whether it was answered correctly
+            
+        Returns:
+            bool: False if admission control rejected the answer, which is then
+                left out of the score and the question count
+        """
+        if not self.last_admitted:
+            self.total_questions -= 1
+            return False
+        
+        if is_correct:
+            self.score += 1
+        
+        if self.scheduler is not None and self.user_id is not None:
+            quality = grade_answer(is_correct, self.last_response_time, self.time_limit)
+            self.scheduler.record(self.user_id, question, quality)
+        
+        if self.pipeline is not None:
+            self.pipeline.submit(AnswerEvent(self.user_id, question, self.last_answer,
+                                             self.last_response_time))
+        return True
+    
+    def conduct_adaptive(self, questions, max_questions, category, subcategory):
+        """
+        Ask questions chosen to be most informative at the current ability estimate
+        
+        Args:
+            questions (list): Questions in the selected subcategory
+            max_questions (int): Upper bound on questions asked
+            category (str): Selected category
+            subcategory (str): Selected subcategory
+        """
+        bank = self.calibration.item_bank(questions, cache_key=(category, subcategory))
+        session = AdaptiveSession(bank, max_items=max_questions)
+        
+        limit = session.max_items
+        self.total_questions = 0
+        self.score = 0
+        
+        print(f'\n🚀 Starting Adaptive Quiz!')
+        print(f'Up to {limit} questions; the quiz ends early once your level is clear.')
+        print(f'Category: {category} > {subcategory}')
+        print(f'Time per question: {self.time_limit} seconds')
+        
+        input('\nPress Enter to begin...')
+        
+        asked = 0
+        item = session.next_item()
+        while item is not None:
+            asked += 1
+            self.total_questions += 1
+            question = bank.questions[item]
+            is_correct = self.ask_question_with_timer(question, asked, limit)
+            if self.record_answer(question, is_correct):
+                session.record(item, is_correct)
+            else:
+                session.skip(item)
+            
+            item = session.next_item()
+            if item is not None:
+                time.sleep(1)
+        
+        self.ability = (session.theta, session.standard_error)
+        print(f'\n📐 Estimated ability: {session.theta:+.2f} (± {session.standard_error:.2f})')
+    
     def conduct(self):
         """Main method to conduct the quiz"""
+        session_ticket = None
         try:
             if not self.questions:
                 print('❌ No questions available!')
@@ -272,9 +422,23 @@ class Quiz:
             # Get number of questions to ask
             num_to_ask = self.get_number_of_questions(len(filtered_questions))
             
-            # Randomize questions
-            random.shuffle(filtered_questions)
-            selected_questions = filtered_questions[:num_to_ask]
+            if self.admission is not None:
+                session_ticket = self.admission.start_session(
+                    self.user_id, f'{selected_category}/{selected_subcategory}')
+            
+            if self.calibration is not None:
+                self.conduct_adaptive(filtered_questions, num_to_ask, selected_category, selected_subcategory)
+                self.display_final_results()
+                self.record_leaderboard_result(selected_category)
+                return
+            
+            # Randomize questions, or pick due reviews first in review mode
+            with SAMPLE_SECONDS.time():
+                if self.scheduler is not None and self.user_id is not None:
+                    selected_questions = self.scheduler.select(self.user_id, filtered_questions, num_to_ask)
+                else:
+                    random.shuffle(filtered_questions)
+                    selected_questions = filtered_questions[:num_to_ask]
             
             self.total_questions = len(selected_questions)
             self.score = 0
@@ -288,8 +452,8 @@ class Quiz:
             
             # Ask questions - Fixed the question numbering here
             for i, question in enumerate(selected_questions):
-                if self.ask_question_with_timer(question, i + 1, self.total_questions):
-                    self.score += 1
+                is_correct = self.ask_question_with_timer(question, i + 1, len(selected_questions))
+                self.record_answer(question, is_correct)
                 
                 # Brief pause between questions
                 if i < len(selected_questions) - 1:
@@ -297,11 +461,17 @@ class Quiz:
             
             # Display results
             self.display_final_results()
+            self.record_leaderboard_result(selected_category)
             
         except KeyboardInterrupt:
             print('\n\n🛑 Quiz interrupted by user.')
             if self.total_questions > 0:
                 print(f'Partial score: {self.score}/{self.total_questions}')
+        except AdmissionRejected as e:
+            print(f'\n⏳ {e}. Please try again later.')
         except Exception as e:
             print(f'\n❌ An error occurred during the quiz: {e}')
             print('Please contact support if this issue persists.')
+        finally:
+            if session_ticket is not None:
+                session_ticket.release()
@@ -1,6 +1,15 @@
 import csv
 import os
+import time
 from question import LoadQuestion
+from compressed_store import CompressedBank
+from metrics import REGISTRY
+
+LOAD_SECONDS = REGISTRY.histogram('quiz_loader_load_seconds', 'Time spent parsing a question bank')
+CACHE_LOOKUPS = REGISTRY.counter('quiz_loader_cache_lookups_total', 'Question cache lookups by result')
+ROWS_SKIPPED = REGISTRY.counter('quiz_loader_rows_skipped_total', 'CSV rows rejected while loading')
+LOAD_ERRORS = REGISTRY.counter('quiz_loader_load_errors_total', 'Bank loads that failed by error type')
+CACHED_QUESTIONS = REGISTRY.gauge('quiz_loader_cached_questions', 'Questions currently held in the cache')
 
 class QuizLoader:
     """Utility class for loading quiz questions from CSV files with memory optimization"""
@@ -8,6 +17,9 @@ class QuizLoader:
     # Class-level cache to avoid reloading the same file
     _cache = {}
     
+    # Optional read-only shared bank attached by worker processes
+    _shared = None
+    
     @staticmethod
     def load_questions(file_path):
         """
@@ -22,11 +34,21 @@ class QuizLoader:
         Returns:
             list: List of LoadQuestion objects
         """
+        bank = os.path.basename(file_path)
+        
+        # Workers attached to a shared bank read it zero-copy instead of parsing
+        if QuizLoader._shared is not None and file_path in QuizLoader._shared:
+            CACHE_LOOKUPS.inc(result='shared')
+            return QuizLoader._shared.load_questions(file_path)
+        
         # Check cache first
         if file_path in QuizLoader._cache:
+            CACHE_LOOKUPS.inc(result='hit')
             print(f"📋 Loading from cache: {file_path}")
             return QuizLoader._cache[file_path]
         
+        CACHE_LOOKUPS.inc(result='miss')
+        start_time = time.perf_counter()
         questions = []
         skipped_rows = 0
         
@@ -138,30 +160,39 @@ class QuizLoader:
                         continue
         
         except FileNotFoundError as e:
+            LOAD_ERRORS.inc(error='not_found')
             print(f"❌ File Error: {e}")
             print(f"Please ensure the file exists at: {file_path}")
             return []
         
         except PermissionError as e:
+            LOAD_ERRORS.inc(error='permission')
             print(f"❌ Permission Error: {e}")
             print(f"Please check file permissions for: {file_path}")
             return []
         
         except csv.Error as e:
+            LOAD_ERRORS.inc(error='csv')
             print(f"❌ CSV Format Error: {e}")
             print(f"Please check the CSV file format at: {file_path}")
             return []
         
         except UnicodeDecodeError as e:
+            LOAD_ERRORS.inc(error='encoding')
             print(f"❌ Encoding Error: {e}")
             print(f"Please ensure the file is saved in UTF-8 encoding: {file_path}")
             return []
         
         except Exception as e:
+            LOAD_ERRORS.inc(error='unexpected')
             print(f"❌ Unexpected Error: {e}")
             print(f"Please contact support if this issue persists.")
             return []
         
+        elapsed_time = time.perf_counter() - start_time
+        LOAD_SECONDS.observe(elapsed_time, bank=bank)
+        ROWS_SKIPPED.inc(skipped_rows, bank=bank)
+        
         # Summary report
         total_processed = len(questions) + skipped_rows
         print(f"\n📊 Loading Summary:")
@@ -181,15 +212,62 @@ class QuizLoader:
         
         # Cache the results for future use
         QuizLoader._cache[file_path] = questions
+        CACHED_QUESTIONS.inc(len(questions))
         
         return questions
     
+    @staticmethod
+    def load_compressed(file_path, block_size=64, cache_blocks=16):
+        """
+        Load questions and keep them in block-compressed form
+        
+        The cached LoadQuestion list is replaced by a CompressedBank, so later
+        load_questions calls for the same file return the compressed bank too.
+        
+        Args:
+            file_path (str): Path to the CSV file
+            block_size (int): Questions per compressed block
+            cache_blocks (int): Decompressed blocks kept hot
+            
+        Returns:
+            CompressedBank: Sequence of questions decompressed on access
+        """
+        questions = QuizLoader.load_questions(file_path)
+        if isinstance(questions, CompressedBank) or not questions:
+            return questions
+        
+        bank = CompressedBank(questions, block_size=block_size, cache_blocks=cache_blocks,
+                              bank=os.path.basename(file_path))
+        if file_path in QuizLoader._cache:
+            QuizLoader._cache[file_path] = bank
+        print(f"🗜️  Compressed {len(bank)} questions: {bank.raw_bytes / 1024:.1f} KB -> "
+              f"{bank.compressed_bytes / 1024:.1f} KB")
+        return bank
+    
     @staticmethod
     def clear_cache():
         """Clear the question cache to free memory"""
         QuizLoader._cache.clear()
+        CACHED_QUESTIONS.set(0)
         # print("🗑️  Question cache cleared")
     
+    @staticmethod
+    def attach_shared(reader):
+        """
+        Serve banks from a shared, read-only segment instead of the local cache
+        
+        Args:
+            reader (SharedBankReader): Reader attached to the parent's banks, or None to detach
+        """
+        QuizLoader._shared = reader
+    
+    @staticmethod
+    def evict(file_path):
+        """Drop a single file from the question cache"""
+        questions = QuizLoader._cache.pop(file_path, None)
+        if questions is not None:
+            CACHED_QUESTIONS.dec(len(questions))
+    
     @staticmethod
     def get_cache_info():
         """Get information about cached files"""
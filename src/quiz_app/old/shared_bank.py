@@ -0,0 +1,316 @@
+import json
+import os
+import struct
+import weakref
+from multiprocessing import shared_memory
+from question import LoadQuestion
+from quiz_loader import QuizLoader
+from metrics import REGISTRY
+from memory_report import track
+
+SHARED_GENERATION = REGISTRY.gauge('shared_bank_generation', 'Generation of the attached shared question bank')
+SHARED_BYTES = REGISTRY.gauge('shared_bank_bytes', 'Size of the shared question bank segment')
+SHARED_ATTACHES = REGISTRY.counter('shared_bank_attaches_total', 'Shared bank segment attaches by role')
+
+# Segment layout:
+#   header      magic, layout version, generation, question count, directory length
+#   directory   UTF-8 JSON {bank_path: [first_index, end_index]}, padded to 4 bytes
+#   offsets     uint32[question_count * FIELDS + 1] into the string blob
+#   blob        UTF-8 strings, FIELDS per question in the order below
+MAGIC = b'QZB1'
+LAYOUT_VERSION = 1
+HEADER = struct.Struct('<4sIQII')
+CONTROL = struct.Struct('<Q')
+FIELDS = 8  # category, subcategory, question, option1-4, answer
+CATEGORY, SUBCATEGORY, QUESTION, OPTIONS, ANSWER = 0, 1, 2, 3, 7
+
+
+def _bank_key(file_path):
+    """Normalize a bank path so parent and workers agree on directory keys"""
+    return os.path.normpath(os.path.abspath(file_path))
+
+
+def _attach(name):
+    """Attach to an existing segment without handing its lifetime to this process"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching always registers the segment with the
+        # resource tracker; workers started through multiprocessing share the
+        # parent's tracker, so the publisher still owns the unlink.
+        return shared_memory.SharedMemory(name=name)
+
+
+def encode_banks(banks, generation):
+    """
+    Encode question banks into the flat shared layout
+
+    Args:
+        banks (dict): Mapping of bank path to list of LoadQuestion objects
+        generation (int): Generation number stored in the header
+
+    Returns:
+        bytes: Encoded segment contents
+    """
+    directory = {}
+    offsets = [0]
+    chunks = []
+    position = 0
+    count = 0
+
+    for file_path, questions in banks.items():
+        start = count
+        for question in questions:
+            options = list(question.options[:4]) + [''] * (4 - len(question.options[:4]))
+            for value in (question.category, question.subcategory, question.question,
+                          *options, question.answer):
+                encoded = value.encode('utf-8')
+                chunks.append(encoded)
+                position += len(encoded)
+                offsets.append(position)
+            count += 1
+        directory[_bank_key(file_path)] = [start, count]
+
+    directory_bytes = json.dumps(directory).encode('utf-8')
+    directory_bytes += b' ' * (-len(directory_bytes) % 4)
+    header = HEADER.pack(MAGIC, LAYOUT_VERSION, generation, count, len(directory_bytes))
+    offsets_bytes = struct.pack(f'<{len(offsets)}I', *offsets)
+    return b''.join([header, directory_bytes, offsets_bytes, *chunks])
+
+
+class _Generation:
+    """One attached, read-only generation of the shared segment"""
+
+    def __init__(self, name):
+        self.shm = _attach(name)
+        buf = self.shm.buf.toreadonly()
+        magic, version, generation, count, directory_length = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            buf.release()
+            self.shm.close()
+            raise ValueError(f"Segment {name} is not a version {LAYOUT_VERSION} question bank")
+
+        self.generation = generation
+        self.count = count
+        directory_start = HEADER.size
+        offsets_start = directory_start + directory_length
+        offsets_end = offsets_start + (count * FIELDS + 1) * 4
+        self.directory = json.loads(bytes(buf[directory_start:offsets_start]))
+
+        # Zero-copy views over the segment; strings are decoded on access only
+        self._buf = buf
+        self.offsets = buf[offsets_start:offsets_end].cast('I')
+        self.blob = buf[offsets_end:]
+        self._finalizer = weakref.finalize(self, _Generation._release,
+                                           self.shm, [self.offsets, self.blob, buf])
+
+    @staticmethod
+    def _release(shm, views):
+        for view in views:
+            view.release()
+        shm.close()
+
+    def field(self, index, field):
+        """Decode a single string field of a question"""
+        slot = index * FIELDS + field
+        return str(self.blob[self.offsets[slot]:self.offsets[slot + 1]], 'utf-8')
+
+
+class SharedQuestion(LoadQuestion):
+    """LoadQuestion view whose fields are decoded from shared memory on access"""
+
+    def __init__(self, generation, index):
+        # Validation happened in the parent when the bank was loaded
+        self._generation = generation
+        self._index = index
+
+    @property
+    def category(self):
+        return self._generation.field(self._index, CATEGORY)
+
+    @property
+    def subcategory(self):
+        return self._generation.field(self._index, SUBCATEGORY)
+
+    @property
+    def question(self):
+        return self._generation.field(self._index, QUESTION)
+
+    @property
+    def options(self):
+        values = (self._generation.field(self._index, OPTIONS + i) for i in range(4))
+        return [value for value in values if value]
+
+    @property
+    def answer(self):
+        return self._generation.field(self._index, ANSWER)
+
+
+class SharedBank:
+    """Read-only sequence of questions for one bank inside a shared segment"""
+
+    def __init__(self, generation, start, end):
+        self._generation = generation
+        self._start = start
+        self._end = end
+
+    @property
+    def generation(self):
+        return self._generation.generation
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SharedBank index out of range")
+        return SharedQuestion(self._generation, self._start + index)
+
+    def __iter__(self):
+        for index in range(self._start, self._end):
+            yield SharedQuestion(self._generation, index)
+
+
+class SharedBankPublisher:
+    """Parent-side owner that loads banks once and publishes them to workers"""
+
+    def __init__(self, name='quiz_bank'):
+        """
+        Create the control segment holding the generation counter
+
+        Args:
+            name (str): Segment name prefix shared with the workers
+        """
+        self.name = name
+        self.generation = 0
+        self._control = shared_memory.SharedMemory(
+            name=f'{name}_ctl', create=True, size=CONTROL.size)
+        CONTROL.pack_into(self._control.buf, 0, 0)
+        self._segment = None
+
+    def publish(self, file_paths):
+        """
+        Load banks and publish them as a new generation
+
+        Workers pick the new generation up on their next refresh; the previous
+        segment is unlinked and disappears once the last worker detaches.
+
+        Args:
+            file_paths (list): Paths of the CSV banks to publish
+
+        Returns:
+            int: The new generation number
+        """
+        banks = {}
+        for file_path in file_paths:
+            banks[file_path] = QuizLoader.load_questions(file_path)
+
+        generation = self.generation + 1
+        payload = encode_banks(banks, generation)
+        segment = shared_memory.SharedMemory(
+            name=f'{self.name}_g{generation}', create=True, size=len(payload))
+        segment.buf[:len(payload)] = payload
+
+        # Only flip the counter once the new segment is fully written
+        CONTROL.pack_into(self._control.buf, 0, generation)
+        previous, self._segment, self.generation = self._segment, segment, generation
+
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+
+        # The shared segment is now the source of truth for these banks
+        for file_path in file_paths:
+            QuizLoader.evict(file_path)
+
+        SHARED_ATTACHES.inc(role='publisher')
+        SHARED_GENERATION.set(generation)
+        SHARED_BYTES.set(len(payload))
+        print(f"📡 Published {len(banks)} bank(s) as generation {generation} ({len(payload) / (1024 * 1024):.2f} MB)")
+        return generation
+
+    def close(self):
+        """Unlink the current generation and the control segment"""
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+        self._control.close()
+        self._control.unlink()
+
+
+class SharedBankReader:
+    """Worker-side zero-copy, read-only view of the published banks"""
+
+    def __init__(self, name='quiz_bank'):
+        """
+        Attach to the publisher's control segment and current generation
+
+        Args:
+            name (str): Segment name prefix used by the publisher
+        """
+        self.name = name
+        self._control = _attach(f'{name}_ctl')
+        self._current = None
+        self.refresh()
+        track('index', f'shared-bank-{name}', self)
+
+    @property
+    def generation(self):
+        return self._current.generation if self._current else 0
+
+    def refresh(self):
+        """
+        Re-attach if the publisher has swapped in a new generation
+
+        Questions handed out earlier keep their generation mapped until they
+        are garbage collected.
+
+        Returns:
+            bool: True if a new generation was attached
+        """
+        generation = CONTROL.unpack_from(self._control.buf, 0)[0]
+        while True:
+            if generation == 0 or generation == self.generation:
+                return False
+            try:
+                self._current = _Generation(f'{self.name}_g{generation}')
+                break
+            except FileNotFoundError:
+                # The publisher swapped again and unlinked this generation
+                # between reading the counter and attaching; follow the counter
+                latest = CONTROL.unpack_from(self._control.buf, 0)[0]
+                if latest == generation:
+                    raise
+                generation = latest
+        SHARED_ATTACHES.inc(role='worker')
+        SHARED_GENERATION.set(generation)
+        return True
+
+    def __contains__(self, file_path):
+        return self._current is not None and _bank_key(file_path) in self._current.directory
+
+    def load_questions(self, file_path):
+        """
+        Return the shared bank for a file path
+
+        Args:
+            file_path (str): Path the bank was published under
+
+        Returns:
+            SharedBank: Read-only question sequence, or [] if not published
+        """
+        self.refresh()
+        if file_path not in self:
+            return []
+        start, end = self._current.directory[_bank_key(file_path)]
+        return SharedBank(self._current, start, end)
+
+    def close(self):
+        """Detach from the control segment"""
+        self._current = None
+        self._control.close()
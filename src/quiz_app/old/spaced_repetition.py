@@ -0,0 +1,365 @@
+import bisect
+import heapq
+import os
+import random
+import struct
+import time
+from array import array
+from question import question_key
+from metrics import REGISTRY
+from memory_report import track
+
+REVIEWS = REGISTRY.counter('review_grades_total', 'Spaced-repetition reviews recorded by quality')
+REVIEW_ITEMS = REGISTRY.gauge('review_tracked_items', 'Tracked (user, question) review states')
+
+SECONDS_PER_DAY = 86400
+DEFAULT_EASINESS = 250  # SM-2 easiness factor 2.5, stored in hundredths
+MIN_EASINESS = 130
+MAX_INTERVAL = 65535  # Days; interval is stored as an unsigned short
+
+FILE_MAGIC = b'QZSR'
+FILE_HEADER = struct.Struct('<4sI')  # magic, user count
+USER_HEADER = struct.Struct('<HI')  # user id length, item count
+
+
+def today():
+    """Return the current day number since the unix epoch"""
+    return int(time.time() // SECONDS_PER_DAY)
+
+
+def grade_answer(is_correct, response_time=None, time_limit=None):
+    """
+    Map a quiz answer onto the SM-2 quality scale (0-5)
+
+    Args:
+        is_correct (bool): Whether the answer was correct
+        response_time (float, optional): Seconds taken, None if unanswered
+        time_limit (float, optional): Time allowed for the question
+
+    Returns:
+        int: Quality grade
+    """
+    if response_time is None:
+        return 0
+    if not is_correct:
+        return 2
+    if not time_limit:
+        return 4
+    if response_time <= time_limit / 3:
+        return 5
+    if response_time <= time_limit * 2 / 3:
+        return 4
+    return 3
+
+
+class UserReviewState:
+    """Compact per-user SM-2 state in parallel arrays with an indexed due-date heap"""
+
+    def __init__(self):
+        # 25 bytes per pair and no per-pair Python objects: 13 for the SM-2
+        # columns, 4 for the key index, 8 for the heap and its positions
+        self.keys = array('I')
+        self.easiness = array('H')
+        self.interval = array('H')
+        self.repetitions = array('B')
+        self.due = array('I')
+        # Slots ordered by key, searched with bisect
+        self._index = array('I')
+        # Slots in binary heap order by (due, slot), and each slot's heap position
+        self._heap = array('I')
+        self._positions = array('I')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return self._find(key)[0] is not None
+
+    def _find(self, key):
+        """Return (slot or None, index position where key is or would be)"""
+        position = bisect.bisect_left(self._index, key, key=self.keys.__getitem__)
+        if position < len(self._index) and self.keys[self._index[position]] == key:
+            return self._index[position], position
+        return None, position
+
+    def _slot(self, key):
+        slot, position = self._find(key)
+        if slot is None:
+            slot = len(self.keys)
+            self.keys.append(key)
+            self.easiness.append(DEFAULT_EASINESS)
+            self.interval.append(0)
+            self.repetitions.append(0)
+            self.due.append(0)
+            self._index.insert(position, slot)
+            self._heap.append(slot)
+            self._positions.append(len(self._heap) - 1)
+        return slot
+
+    def _order(self, slot):
+        return self.due[slot] << 32 | slot
+
+    def _sift_up(self, position):
+        heap, positions = self._heap, self._positions
+        slot = heap[position]
+        order = self._order(slot)
+        while position > 0:
+            parent = (position - 1) >> 1
+            parent_slot = heap[parent]
+            if self._order(parent_slot) <= order:
+                break
+            heap[position] = parent_slot
+            positions[parent_slot] = position
+            position = parent
+        heap[position] = slot
+        positions[slot] = position
+
+    def _sift_down(self, position):
+        heap, positions = self._heap, self._positions
+        size = len(heap)
+        slot = heap[position]
+        order = self._order(slot)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._order(heap[child + 1]) < self._order(heap[child]):
+                child += 1
+            child_slot = heap[child]
+            if self._order(child_slot) >= order:
+                break
+            heap[position] = child_slot
+            positions[child_slot] = position
+            position = child
+        heap[position] = slot
+        positions[slot] = position
+
+    def review(self, key, quality, day):
+        """
+        Apply one SM-2 review
+
+        Args:
+            key (int): Question key
+            quality (int): Grade 0-5
+            day (int): Day number of the review
+
+        Returns:
+            int: Day number the question is next due
+        """
+        slot = self._slot(key)
+        easiness = self.easiness[slot] / 100
+        repetitions = self.repetitions[slot]
+
+        if quality >= 3:
+            if repetitions == 0:
+                interval = 1
+            elif repetitions == 1:
+                interval = 6
+            else:
+                interval = round(self.interval[slot] * easiness)
+            repetitions = min(repetitions + 1, 255)
+        else:
+            repetitions = 0
+            interval = 1
+
+        easiness += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        self.easiness[slot] = max(MIN_EASINESS, round(easiness * 100))
+        self.interval[slot] = min(interval, MAX_INTERVAL)
+        self.repetitions[slot] = repetitions
+        self.due[slot] = day + self.interval[slot]
+
+        # The slot's heap entry is moved in place, so the heap never holds stale entries
+        self._sift_up(self._positions[slot])
+        self._sift_down(self._positions[slot])
+        return self.due[slot]
+
+    def due_keys(self, day, limit):
+        """
+        Return up to limit keys due on or before day, most overdue first
+
+        Walks the heap best-first without modifying it, costing O(k log k)
+        for k returned items.
+
+        Args:
+            day (int): Day number to compare against
+            limit (int): Maximum number of keys
+
+        Returns:
+            list: Due question keys
+        """
+        heap = self._heap
+        keys = []
+        frontier = [self._order(heap[0])] if heap else []
+        while frontier and len(keys) < limit:
+            order = heapq.heappop(frontier)
+            slot = order & 0xFFFFFFFF
+            if order >> 32 > day:
+                break
+            keys.append(self.keys[slot])
+            child = 2 * self._positions[slot] + 1
+            for position in (child, child + 1):
+                if position < len(heap):
+                    heapq.heappush(frontier, self._order(heap[position]))
+        return keys
+
+    def to_bytes(self):
+        """Serialize the arrays (the key index and heap are rebuilt on load)"""
+        return b''.join(column.tobytes() for column in
+                        (self.keys, self.easiness, self.interval, self.repetitions, self.due))
+
+    @classmethod
+    def from_bytes(cls, data, count):
+        """Rebuild state from to_bytes() output holding count items"""
+        state = cls()
+        offset = 0
+        for column in (state.keys, state.easiness, state.interval, state.repetitions, state.due):
+            size = column.itemsize * count
+            column.frombytes(data[offset:offset + size])
+            offset += size
+        state._index = array('I', sorted(range(count), key=state.keys.__getitem__))
+        # A sorted array is a valid heap
+        state._heap = array('I', sorted(range(count), key=state._order))
+        state._positions = array('I', bytes(4 * count))
+        for position, slot in enumerate(state._heap):
+            state._positions[slot] = position
+        return state
+
+    @classmethod
+    def byte_size(cls, count):
+        """Serialized size of a state holding count items"""
+        return sum(array(code).itemsize for code in 'IHHBI') * count
+
+
+class ReviewScheduler:
+    """SM-2 spaced-repetition scheduler across users"""
+
+    def __init__(self):
+        self._users = {}
+        track('index', f'review-scheduler-{id(self)}', self)
+
+    def state(self, user_id):
+        """Return (creating if needed) a user's review state"""
+        state = self._users.get(user_id)
+        if state is None:
+            state = UserReviewState()
+            self._users[user_id] = state
+        return state
+
+    def record(self, user_id, question, quality, day=None):
+        """
+        Record a review of a question
+
+        Args:
+            user_id (str): User identifier
+            question (LoadQuestion): Question that was answered
+            quality (int): SM-2 grade 0-5, see grade_answer()
+            day (int, optional): Day number, defaults to today
+
+        Returns:
+            int: Day number the question is next due
+        """
+        state = self.state(user_id)
+        tracked = len(state)
+        due = state.review(question_key(question), quality, today() if day is None else day)
+        REVIEWS.inc(quality=quality)
+        if len(state) != tracked:
+            REVIEW_ITEMS.inc()
+        return due
+
+    def due(self, user_id, limit, day=None):
+        """
+        Return the keys of up to limit questions due for review
+
+        Args:
+            user_id (str): User identifier
+            limit (int): Maximum number of keys
+            day (int, optional): Day number, defaults to today
+
+        Returns:
+            list: Question keys, most overdue first
+        """
+        state = self._users.get(user_id)
+        if state is None:
+            return []
+        return state.due_keys(today() if day is None else day, limit)
+
+    def select(self, user_id, questions, count, day=None):
+        """
+        Pick questions for a review session
+
+        Due reviews come first, then questions the user has never seen, then
+        the remaining questions in random order.
+
+        Args:
+            user_id (str): User identifier
+            questions (list): Candidate LoadQuestion objects
+            count (int): Number of questions to select
+            day (int, optional): Day number, defaults to today
+
+        Returns:
+            list: Selected questions
+        """
+        by_key = {question_key(question): question for question in questions}
+        state = self.state(user_id)
+
+        selected = []
+        # Due items outside this pool are skipped, so look a little further
+        for key in state.due_keys(today() if day is None else day, max(count * 4, count + 32)):
+            question = by_key.pop(key, None)
+            if question is not None:
+                selected.append(question)
+                if len(selected) == count:
+                    return selected
+
+        unseen = [question for key, question in by_key.items() if key not in state]
+        seen = [question for key, question in by_key.items() if key in state]
+        random.shuffle(unseen)
+        random.shuffle(seen)
+        selected.extend((unseen + seen)[:count - len(selected)])
+        return selected
+
+    def save(self, file_path):
+        """
+        Save every user's review state to a compact binary file
+
+        The file is written beside the destination and moved into place, so
+        an interrupted save leaves the previous state intact.
+
+        Args:
+            file_path (str): Destination path
+        """
+        temp_path = f'{file_path}.tmp'
+        with open(temp_path, mode='wb') as file:
+            file.write(FILE_HEADER.pack(FILE_MAGIC, len(self._users)))
+            for user_id, state in self._users.items():
+                encoded_id = user_id.encode('utf-8')
+                file.write(USER_HEADER.pack(len(encoded_id), len(state)))
+                file.write(encoded_id)
+                file.write(state.to_bytes())
+        os.replace(temp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a scheduler saved with save()
+
+        Args:
+            file_path (str): Source path
+
+        Returns:
+            ReviewScheduler: Restored scheduler
+        """
+        scheduler = cls()
+        with open(file_path, mode='rb') as file:
+            magic, user_count = FILE_HEADER.unpack(file.read(FILE_HEADER.size))
+            if magic != FILE_MAGIC:
+                raise ValueError(f"Not a review state file: {file_path}")
+            for _ in range(user_count):
+                id_length, count = USER_HEADER.unpack(file.read(USER_HEADER.size))
+                user_id = file.read(id_length).decode('utf-8')
+                data = file.read(UserReviewState.byte_size(count))
+                if len(data) != UserReviewState.byte_size(count):
+                    raise ValueError(f"Truncated review state file: {file_path}")
+                scheduler._users[user_id] = UserReviewState.from_bytes(data, count)
+                REVIEW_ITEMS.inc(count)
+        return scheduler
@@ -0,0 +1,33 @@
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+# The application modules import each other by bare name, as when run as scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'quiz_app' / 'old'))
+
+
+def write_bank(path, count, category='Science', subcategory='Physics'):
+    """Write a CSV bank of count questions in the loader's column layout"""
+    with open(path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Category', 'Subcategory', 'Question', 'Option1', 'Option2', 'Option3', 'Option4', 'Answer'])
+        for i in range(count):
+            writer.writerow([category, subcategory, f'Question {i}?', f'Alpha {i}', f'Beta {i}', f'Gamma {i}',
+                             f'Delta {i}', 'ABCD'[i % 4]])
+    return str(path)
+
+
+@pytest.fixture
+def make_bank(tmp_path):
+    """Factory writing CSV banks into the test's temporary directory"""
+    def make(count, name='bank.csv', **kwargs):
+        return write_bank(tmp_path / name, count, **kwargs)
+    return make
+
+
+@pytest.fixture
+def bank_csv(tmp_path):
+    """Path of a small CSV bank"""
+    return write_bank(tmp_path / 'bank.csv', 12)
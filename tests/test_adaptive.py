@@ -0,0 +1,99 @@
+import random
+from array import array
+
+import adaptive
+from adaptive import AdaptiveSession, ItemCalibration, grid_index
+from question import LoadQuestion
+from spaced_repetition import question_key
+
+
+def make_questions(count, prefix='Question'):
+    return [LoadQuestion('Science', 'Physics', f'{prefix} {i}?', ['One', 'Two'], 'A') for i in range(count)]
+
+
+def test_grid_index_picks_nearest_point():
+    assert grid_index(0.1) == grid_index(0.0)
+    assert grid_index(-10) == 0
+    assert grid_index(10) == grid_index(4.0)
+
+
+def test_calibration_orders_items_by_difficulty():
+    questions = make_questions(2)
+    calibration = ItemCalibration()
+    calibration.calibrate([(question_key(questions[0]), True)] * 20 + [(question_key(questions[1]), False)] * 20)
+
+    easy = calibration.item_parameters(questions[0])[1]
+    hard = calibration.item_parameters(questions[1])[1]
+    assert easy < 0 < hard
+
+
+def test_item_bank_cache_is_not_shared_by_different_pools():
+    calibration = ItemCalibration()
+    first = make_questions(5, prefix='First bank')
+    second = make_questions(5, prefix='Second bank')
+
+    bank = calibration.item_bank(first, cache_key=('Science', 'Physics'))
+    assert calibration.item_bank(first, cache_key=('Science', 'Physics')) is bank
+
+    other = calibration.item_bank(second, cache_key=('Science', 'Physics'))
+    assert other is not bank
+    assert other.questions == second
+
+
+def test_uncalibrated_items_are_not_served_in_bank_order():
+    bank = ItemCalibration().item_bank(make_questions(50))
+    openings = {AdaptiveSession(bank, rng=random.Random(seed)).next_item() for seed in range(20)}
+
+    assert len(openings) > 1
+
+
+def test_session_never_repeats_items_and_stops():
+    bank = ItemCalibration().item_bank(make_questions(8))
+    session = AdaptiveSession(bank, max_items=5, rng=random.Random(1))
+    served = []
+    item = session.next_item()
+    while item is not None:
+        served.append(item)
+        session.record(item, len(served) % 2 == 0)
+        item = session.next_item()
+
+    assert len(served) == 5
+    assert len(set(served)) == 5
+
+
+class CountingTable(array):
+    reads = 0
+
+    def __getitem__(self, index):
+        CountingTable.reads += 1
+        return super().__getitem__(index)
+
+
+def test_step_cost_does_not_grow_with_an_uncalibrated_bank(monkeypatch):
+    bank = ItemCalibration().item_bank(make_questions(20000))
+    bank.tables = [CountingTable('I', table) for table in bank.tables]
+    session = AdaptiveSession(bank, max_items=20, target_standard_error=0.0, rng=random.Random(3))
+    calls = []
+    monkeypatch.setattr(adaptive, 'information', lambda *args: calls.append(args) or 0.0)
+    CountingTable.reads = 0
+
+    served = set()
+    for _ in range(20):
+        item = session.next_item()
+        served.add(item)
+        session.skip(item)
+
+    assert len(served) == 20
+    assert calls == []
+    assert CountingTable.reads < 20 * 50
+
+
+def test_runs_split_items_with_different_information():
+    questions = make_questions(6)
+    calibration = ItemCalibration()
+    calibration.calibrate([(question_key(questions[0]), False)] * 30)
+    bank = calibration.item_bank(questions)
+
+    for table, ends in zip(bank.tables, bank.run_ends):
+        assert ends[-1] == len(table)
+        assert len(ends) == 2
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from adaptive import ItemCalibration
+from admission import AdmissionController, AdmissionRejected, RateLimiter
+from question import LoadQuestion
+from quiz import Quiz
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limiter_refills_over_time():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=1.0, burst=2, clock=clock)
+
+    assert limiter.try_acquire('ana') == 0
+    assert limiter.try_acquire('ana') == 0
+    assert limiter.try_acquire('ana') == pytest.approx(1.0)
+    clock.now = 1.0
+    assert limiter.try_acquire('ana') == 0
+
+
+def test_rate_limiter_bounds_tracked_keys():
+    limiter = RateLimiter(rate=1.0, burst=1, max_keys=2, clock=FakeClock())
+    for key in ('a', 'b', 'c'):
+        limiter.try_acquire(key)
+
+    assert len(limiter) == 2
+
+
+def test_user_over_its_own_limit_does_not_drain_global_capacity():
+    clock = FakeClock()
+    controller = AdmissionController(answer_rate=(1.0, 2), global_rate=(1.0, 3), clock=clock)
+    controller.admit_answer('spammer')
+    controller.admit_answer('spammer')
+    for _ in range(10):
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.admit_answer('spammer')
+        assert rejected.value.reason == 'user_rate'
+
+    controller.admit_answer('ana')
+
+
+def test_global_rejection_refunds_the_user_token():
+    clock = FakeClock()
+    controller = AdmissionController(answer_rate=(1.0, 1), global_rate=(1.0, 1), clock=clock)
+    controller.admit_answer('ana')
+    clock.now = 1.0
+    controller._global.try_acquire(None)  # Someone else takes the refilled global token
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.admit_answer('ben')
+    assert rejected.value.reason == 'global_rate'
+    assert controller._answers._buckets['ben'][0] == 1
+
+
+def test_bank_session_cap_and_release():
+    controller = AdmissionController(max_sessions_per_bank=1, clock=FakeClock())
+    ticket = controller.start_session('ana', 'Physics')
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.start_session('ben', 'Physics')
+    assert rejected.value.reason == 'bank_full'
+
+    ticket.release()
+    ticket.release()
+    controller.start_session('ben', 'Physics').release()
+
+
+def test_rejected_answer_is_neither_scored_nor_recorded(monkeypatch, capsys):
+    question = LoadQuestion('Science', 'Physics', 'Unit of force?', ['Newton', 'Joule'], 'A')
+    controller = AdmissionController(answer_rate=(0.001, 1), clock=FakeClock())
+    quiz = Quiz([question], time_limit=10, user_id='ana', admission=controller)
+    quiz.total_questions = 2
+    checked = []
+    monkeypatch.setattr(question, 'check_correct', lambda answer: checked.append(answer) or True)
+    monkeypatch.setattr('builtins.input', lambda *args: 'A')
+
+    assert quiz.ask_question_with_timer(question, 1, 2) is True
+    assert quiz.record_answer(question, True)
+    assert quiz.ask_question_with_timer(question, 2, 2) is False
+    assert not quiz.record_answer(question, False)
+
+    assert checked == ['A']
+    assert quiz.score == 1
+    assert quiz.total_questions == 1
+    assert 'not scored' in capsys.readouterr().out
+
+    quiz.display_final_results()
+    assert 'Final Score: 1/1 (100.0%)' in capsys.readouterr().out
+
+
+def test_adaptive_results_leave_out_rejected_answers(monkeypatch, capsys):
+    questions = [LoadQuestion('Science', 'Physics', f'Question {i}?', ['Yes', 'No'], 'A') for i in range(5)]
+    controller = AdmissionController(answer_rate=(0.001, 2), clock=FakeClock())
+    quiz = Quiz(questions, time_limit=10, user_id='ana', admission=controller, calibration=ItemCalibration())
+    monkeypatch.setattr('builtins.input', lambda *args: 'A')
+    # Skip the pause between questions; timer threads still sleep for real
+    sleep = time.sleep
+    monkeypatch.setattr('quiz.time.sleep', lambda seconds: sleep(seconds) if seconds > 1 else None)
+
+    quiz.conduct_adaptive(questions, 4, 'Science', 'Physics')
+
+    assert quiz.score == 2
+    assert quiz.total_questions == 2
+    assert 'Question 4/4' in capsys.readouterr().out
@@ -0,0 +1,174 @@
+import csv
+import json
+
+import pytest
+
+import bank_lint
+import main
+from bank_lint import ERROR, WARNING, format_finding, lint_all, lint_bank, lint_manifest
+
+ID_HEADER = ['ID', 'Question', 'Option A', 'Option B', 'Option C', 'Option D', 'Correct Option', 'Timer',
+             'explanation']
+
+
+def write_csv(path, header, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def id_row(number, question=None, options=('Alpha', 'Beta', 'Gamma', 'Delta'), answer='A', timer='45'):
+    return [number, question or f'Question {number}?', *options, answer, timer, '']
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """resources/data layout with two clean banks and a manifest mapping both"""
+    data_dir = tmp_path / 'data'
+    write_csv(data_dir / 'quizzes' / '001_science' / '01_physics.csv', ID_HEADER, [id_row(1), id_row(2)])
+    write_csv(data_dir / 'quizzes' / '001_science' / '02_chemistry.csv', ID_HEADER, [id_row(1), id_row(2)])
+    write_manifest(data_dir, [
+        ['Science', 'Physics', r'.\quizzes\001_science\01_physics.csv'],
+        ['Science', 'Chemistry', r'.\quizzes\001_science\02_chemistry.csv'],
+    ])
+    return data_dir
+
+
+def write_manifest(data_dir, rows):
+    return write_csv(data_dir / 'category_subcategory.csv', ['Category', 'Sub_Category', 'Quiz_File_Path'], rows)
+
+
+def codes(findings):
+    return sorted(finding['code'] for finding in findings)
+
+
+def test_id_layout_is_flagged_for_the_loader(data_dir):
+    findings = lint_bank(str(data_dir / 'quizzes' / '001_science' / '01_physics.csv'))
+
+    assert codes(findings) == ['loader-schema']
+    assert findings[0]['severity'] == WARNING
+
+
+def test_nan_empty_timer_and_duplicate_rows(tmp_path):
+    bank = write_csv(tmp_path / 'bank.csv', ID_HEADER, [
+        id_row(1, options=('nan', 'Beta', 'Gamma', '')),
+        id_row(2, question='Question 1?', timer='soon'),
+    ])
+
+    findings = lint_bank(str(bank))
+
+    assert codes(findings) == ['duplicate-question', 'empty-option', 'loader-schema', 'nan-option', 'timer']
+    nan = next(finding for finding in findings if finding['code'] == 'nan-option')
+    assert nan['line'] == 2 and 'Option A' in nan['message']
+
+
+def test_invalid_question_is_an_error(tmp_path):
+    legacy_header = ['category', 'subcategory', 'question', 'option1', 'option2', 'option3', 'option4', 'answer']
+    bank = write_csv(tmp_path / 'legacy.csv', legacy_header, [
+        ['Science', 'Physics', 'Fine?', 'Yes', 'No', '', '', 'A'],
+        ['Science', 'Physics', 'Only one option?', 'Yes', '', '', '', 'A'],
+    ])
+
+    findings = lint_bank(str(bank))
+
+    assert codes(findings) == ['empty-option', 'empty-option', 'empty-option', 'empty-option', 'empty-option',
+                               'invalid-question']
+    invalid = next(finding for finding in findings if finding['code'] == 'invalid-question')
+    assert invalid['severity'] == ERROR and invalid['line'] == 3
+
+
+def test_unknown_header_and_short_rows(tmp_path):
+    assert codes(lint_bank(str(write_csv(tmp_path / 'odd.csv', ['foo', 'bar'], [])))) == ['unknown-header']
+
+    short = write_csv(tmp_path / 'short.csv', ID_HEADER, [['1', 'Too short?']])
+    assert codes(lint_bank(str(short))) == ['columns', 'loader-schema']
+
+
+def test_manifest_findings(data_dir, tmp_path):
+    write_csv(data_dir / 'quizzes' / '002_history' / '01_ancient.csv', ID_HEADER, [id_row(1)])
+    manifest = write_manifest(data_dir, [
+        ['Science', 'Physics', r'.\quizzes\001_science\01_physics.csv'],
+        ['Science', 'Physics', r'.\quizzes\001_science\01_physics.csv'],
+        ['Science', 'Biology', r'.\quizzes\001_science\02_chemistry.csv'],
+        ['Science', 'Geology', r'.\quizzes\001_science\03_geology.csv'],
+    ])
+    banks = sorted(str(path) for path in (data_dir / 'quizzes').rglob('*.csv'))
+
+    findings = lint_manifest(manifest, tmp_path, banks)
+
+    assert codes(findings) == ['duplicate-bank', 'duplicate-entry', 'missing-bank', 'subcategory-mismatch',
+                               'unmapped-bank']
+    unmapped = next(finding for finding in findings if finding['code'] == 'unmapped-bank')
+    assert '01_ancient.csv' in unmapped['message']
+
+
+def test_cache_skips_unchanged_banks_and_rechecks_edits(data_dir, tmp_path):
+    cache = tmp_path / 'lint-cache.json'
+    first, stats = lint_all(data_dir, tmp_path, cache_path=cache, jobs=1)
+    assert stats['banks'] == 2 and stats['rechecked'] == 2
+
+    second, stats = lint_all(data_dir, tmp_path, cache_path=cache, jobs=1)
+    assert stats['rechecked'] == 0
+    assert second == first
+
+    physics = data_dir / 'quizzes' / '001_science' / '01_physics.csv'
+    write_csv(physics, ID_HEADER, [id_row(1, options=('nan', 'Beta', 'Gamma', 'Delta'))])
+    third, stats = lint_all(data_dir, tmp_path, cache_path=cache, jobs=1)
+    assert stats['rechecked'] == 1
+    assert 'nan-option' in codes(third)
+
+
+def test_lint_version_bump_invalidates_the_cache(data_dir, tmp_path, monkeypatch):
+    cache = tmp_path / 'lint-cache.json'
+    lint_all(data_dir, tmp_path, cache_path=cache, jobs=1)
+    monkeypatch.setattr(bank_lint, 'LINT_VERSION', bank_lint.LINT_VERSION + 1)
+
+    _, stats = lint_all(data_dir, tmp_path, cache_path=cache, jobs=1)
+
+    assert stats['rechecked'] == 2
+    assert json.loads(cache.read_text())['version'] == bank_lint.LINT_VERSION
+
+
+def test_parallel_run_matches_serial_run(data_dir, tmp_path):
+    serial, _ = lint_all(data_dir, tmp_path, jobs=1)
+    parallel, stats = lint_all(data_dir, tmp_path, jobs=2)
+
+    assert stats['rechecked'] == 2
+    assert parallel == serial
+
+
+def run_cli(data_dir, tmp_path, *extra):
+    return main.main(['lint', '--data-dir', str(data_dir), '--cache', str(tmp_path / 'cache.json'),
+                      '--jobs', '1', *extra])
+
+
+def test_cli_json_output_and_exit_codes(data_dir, tmp_path, capsys):
+    assert run_cli(data_dir, tmp_path, '--format', 'json') == 0
+    lines = capsys.readouterr().out.splitlines()
+    findings = [json.loads(line) for line in lines]
+    assert {finding['code'] for finding in findings} == {'loader-schema'}
+    assert set(findings[0]) == {'file', 'line', 'code', 'severity', 'message'}
+
+    # Warnings only fail the run in strict mode
+    assert run_cli(data_dir, tmp_path, '--strict') == 1
+    assert 'Checked 2 banks' in capsys.readouterr().out
+
+
+def test_cli_fails_on_errors(data_dir, tmp_path, capsys):
+    write_manifest(data_dir, [
+        ['Science', 'Physics', r'.\quizzes\001_science\01_physics.csv'],
+        ['Science', 'Physics', r'.\quizzes\001_science\02_chemistry.csv'],
+    ])
+
+    assert run_cli(data_dir, tmp_path) == 1
+    assert '[duplicate-entry]' in capsys.readouterr().out
+
+
+def test_format_finding_includes_location():
+    finding = {'file': 'bank.csv', 'line': 3, 'code': 'timer', 'severity': WARNING, 'message': 'Bad timer'}
+
+    assert format_finding(finding) == 'bank.csv:3: warning [timer] Bad timer'
+    assert format_finding({**finding, 'line': None}).startswith('bank.csv: warning')
@@ -0,0 +1,54 @@
+from compressed_store import CompressedBank
+from quiz_loader import QuizLoader
+from spaced_repetition import ReviewScheduler, question_key
+
+
+def load_bank(make_bank, count=200, block_size=16):
+    path = make_bank(count)
+    QuizLoader.clear_cache()
+    try:
+        questions = QuizLoader.load_questions(path)
+    finally:
+        QuizLoader.clear_cache()
+    return questions, CompressedBank(questions, block_size=block_size, cache_blocks=2)
+
+
+def test_questions_round_trip(make_bank, capsys):
+    questions, bank = load_bank(make_bank)
+
+    assert len(bank) == len(questions)
+    for original, stored in zip(questions, bank):
+        assert stored.category == original.category
+        assert stored.question == original.question
+        assert stored.options == original.options
+        assert stored.answer == original.answer
+    assert bank[-1].question == questions[-1].question
+    assert bank.compressed_bytes < bank.raw_bytes
+
+
+def test_block_cache_is_bounded(make_bank, capsys):
+    _, bank = load_bank(make_bank)
+    for question in bank:
+        question.question
+
+    assert len(bank._cache) == 2
+
+
+def test_review_keys_match_without_decompressing(make_bank, capsys):
+    questions, bank = load_bank(make_bank)
+
+    assert [question_key(question) for question in bank] == [question_key(question) for question in questions]
+    assert len(bank._cache) == 0
+
+
+def test_review_selection_only_decompresses_what_it_serves(make_bank, capsys):
+    _, bank = load_bank(make_bank)
+    scheduler = ReviewScheduler()
+    for question in bank[:5]:
+        scheduler.record('ana', question, 1, day=100)
+    bank.clear_block_cache()
+
+    selected = scheduler.select('ana', bank, 5, day=101)
+
+    assert [question.review_key for question in selected] == [bank.review_key(i) for i in range(5)]
+    assert len(bank._cache) == 0
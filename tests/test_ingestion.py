@@ -0,0 +1,107 @@
+import json
+import threading
+
+import pytest
+
+import ingestion
+from ingestion import BLOCK, DROP, AnswerEvent, AnswerPipeline
+from question import LoadQuestion
+
+
+class BrokenQuestion:
+    question = 'Broken?'
+
+    def check_correct(self, answer):
+        raise RuntimeError('bad row')
+
+
+def test_drain_thread_survives_a_failing_batch():
+    question = LoadQuestion('Science', 'Physics', 'Fine?', ['Yes', 'No'], 'A')
+    pipeline = AnswerPipeline(batch_size=1, flush_interval=0.01)
+    with pipeline:
+        pipeline.submit(AnswerEvent('ana', BrokenQuestion(), 'A'))
+        pipeline.submit(AnswerEvent('ana', question, 'A'))
+        pipeline.submit(AnswerEvent('ben', question, 'B'))
+
+    assert pipeline.depth() == 0
+    assert pipeline.aggregates.user_score('ana') == (1, 1)
+    assert pipeline.aggregates.user_score('ben') == (0, 1)
+
+
+def make_events(count, question=None):
+    question = question or LoadQuestion('Science', 'Physics', 'Fine?', ['Yes', 'No'], 'A')
+    return [AnswerEvent(f'user{i % 3}', question, 'AB'[i % 2], response_time=1.0) for i in range(count)]
+
+
+def test_drop_policy_rejects_when_full():
+    pipeline = AnswerPipeline(max_queue=2, overflow=DROP)
+    dropped = ingestion.ANSWERS_DROPPED.value()
+    enqueued = ingestion.ANSWERS_ENQUEUED.value()
+
+    results = [pipeline.submit(event) for event in make_events(3)]
+
+    assert results == [True, True, False]
+    assert pipeline.depth() == 2
+    assert ingestion.ANSWERS_DROPPED.value() == dropped + 1
+    assert ingestion.ANSWERS_ENQUEUED.value() == enqueued + 2
+
+
+def test_block_policy_waits_then_drops():
+    pipeline = AnswerPipeline(max_queue=1, overflow=BLOCK, block_timeout=0.01)
+    blocked = ingestion.ANSWERS_BLOCKED.value()
+    dropped = ingestion.ANSWERS_DROPPED.value()
+
+    assert [pipeline.submit(event) for event in make_events(2)] == [True, False]
+    assert ingestion.ANSWERS_BLOCKED.value() == blocked + 1
+    assert ingestion.ANSWERS_DROPPED.value() == dropped + 1
+
+
+def test_block_policy_succeeds_once_space_frees_up():
+    pipeline = AnswerPipeline(max_queue=1, overflow=BLOCK, block_timeout=5)
+    first, second = make_events(2)
+    pipeline.submit(first)
+    threading.Timer(0.05, pipeline._queue.get).start()
+
+    assert pipeline.submit(second)
+    assert pipeline.depth() == 1
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        AnswerPipeline(overflow='spill')
+
+
+def test_batches_are_capped_at_batch_size_and_appended_once(tmp_path, monkeypatch):
+    log_path = tmp_path / 'answers.jsonl'
+    pipeline = AnswerPipeline(log_path=str(log_path), max_queue=20, batch_size=4, flush_interval=0.01)
+    for event in make_events(10):
+        assert pipeline.submit(event)
+
+    sizes = []
+    process_batch = pipeline.process_batch
+    monkeypatch.setattr(pipeline, 'process_batch', lambda batch: sizes.append(len(batch)) or process_batch(batch))
+    opens = []
+    monkeypatch.setattr(ingestion, 'open', lambda *args, **kwargs: opens.append(args) or open(*args, **kwargs),
+                        raising=False)
+    pipeline.start()
+    pipeline.stop()
+
+    assert sizes == [4, 4, 2]
+    assert len(opens) == 3
+    entries = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert len(entries) == 10
+    assert entries[0]['question'] == 'Fine?' and entries[0]['correct'] is True
+    assert entries[1]['correct'] is False
+
+
+def test_stop_drains_everything_queued():
+    pipeline = AnswerPipeline(max_queue=500, batch_size=16, flush_interval=0.01).start()
+    for event in make_events(300):
+        pipeline.submit(event)
+    pipeline.stop()
+
+    assert pipeline.depth() == 0
+    answered = sum(pipeline.aggregates.user_score(f'user{i}')[1] for i in range(3))
+    correct = sum(pipeline.aggregates.user_score(f'user{i}')[0] for i in range(3))
+    assert (correct, answered) == (150, 300)
+    assert pipeline.aggregates.question_totals['Fine?'] == [150, 300]
@@ -0,0 +1,68 @@
+from leaderboard import Leaderboard, ScoreBoard, SECONDS_PER_DAY
+
+
+def test_rank_and_top_order_by_score():
+    board = ScoreBoard()
+    for user_id, score in (('ana', 30), ('ben', 50), ('cy', 10), ('dee', 50)):
+        board.set_score(user_id, score)
+
+    assert board.top(3) == [('ben', 50), ('dee', 50), ('ana', 30)]
+    assert board.rank('ben') == 1
+    assert board.rank('dee') == 1
+    assert board.rank('ana') == 3
+    assert board.rank('cy') == 4
+    assert board.rank('nobody') is None
+
+
+def test_top_reads_only_k_members_of_a_large_tie():
+    board = ScoreBoard()
+    for i in range(10000):
+        board.set_score(f'user{i}', 100)
+    board.set_score('leader', 200)
+
+    assert board.top(3) == [('leader', 200), ('user0', 100), ('user1', 100)]
+    assert board.rank('user9999') == 2
+
+
+def test_board_grows_past_initial_capacity():
+    board = ScoreBoard(capacity=4)
+    board.set_score('low', 3)
+    board.set_score('high', 1000)
+    board.add_points('low', 5000)
+
+    assert board.top(2) == [('low', 5003), ('high', 1000)]
+    assert board.rank('high') == 2
+    assert len(board) == 2
+
+
+def test_moving_a_user_updates_counts():
+    board = ScoreBoard()
+    board.set_score('ana', 10)
+    board.set_score('ben', 20)
+    board.set_score('ana', 30)
+
+    assert board.top(5) == [('ana', 30), ('ben', 20)]
+    assert board.rank('ben') == 2
+
+
+def test_daily_window_expires():
+    leaderboard = Leaderboard()
+    day = 100 * SECONDS_PER_DAY
+    leaderboard.record('ana', 'Math', 5, now=day)
+
+    assert leaderboard.rank('ana', window='daily', now=day) == (1, 5, 1)
+    assert leaderboard.rank('ana', window='daily', now=day + SECONDS_PER_DAY) is None
+    assert leaderboard.rank('ana', window='all', now=day + SECONDS_PER_DAY) == (1, 5, 1)
+
+
+def test_save_and_load_keep_standings_across_runs(tmp_path):
+    state = tmp_path / 'leaderboard.json'
+    first = Leaderboard(clock=lambda: 0)
+    first.record('ana', 'Math', 8)
+    first.save(state)
+
+    second = Leaderboard.load(state, clock=lambda: 0)
+    second.record('ben', 'Math', 5)
+
+    assert second.rank('ben') == (2, 5, 2)
+    assert second.top(category='Math') == [('ana', 8), ('ben', 5)]
@@ -0,0 +1,92 @@
+from live_round import LiveRound, LiveSession
+from question import LoadQuestion
+
+
+def make_question():
+    return LoadQuestion('Science', 'Physics', 'Unit of force?', ['Newton', 'Joule', 'Watt', 'Pascal'], 'A')
+
+
+def open_round(players, duration=60):
+    live_round = LiveRound(make_question(), duration)
+    live_round.open({player_id: lambda payload: None for player_id in players})
+    return live_round
+
+
+def test_distribution_counts_first_answer_per_player():
+    live_round = open_round(['ana', 'ben', 'cy'])
+    assert live_round.submit('ana', 'A')
+    assert not live_round.submit('ana', 'B')
+    assert live_round.submit('ben', '2')
+    assert not live_round.submit('cy', 'Z')
+
+    result = live_round.close()
+
+    assert result.distribution == {'A': 1, 'B': 1, 'C': 0, 'D': 0}
+    assert result.correct == 1
+    assert result.unanswered == 1
+    assert live_round.correct_players() == ['ana']
+
+
+def test_non_participants_are_rejected():
+    live_round = open_round(['ana'])
+
+    assert not live_round.submit('mallory', 'A')
+    assert live_round.close().answered == 0
+
+
+def test_submissions_before_open_and_after_close_are_rejected():
+    live_round = LiveRound(make_question(), 60)
+    assert not live_round.submit('ana', 'A')
+
+    live_round.open({'ana': lambda payload: None})
+    live_round.close()
+    assert not live_round.submit('ana', 'A')
+
+
+class RacingAnswers(dict):
+    """Answer dict that closes the round around a submission's setdefault"""
+
+    def __init__(self, live_round, close_first):
+        super().__init__()
+        self.live_round = live_round
+        self.close_first = close_first
+
+    def setdefault(self, key, value):
+        if self.close_first:
+            self.live_round.close()
+            return super().setdefault(key, value)
+        stored = super().setdefault(key, value)
+        self.live_round.close()
+        return stored
+
+
+def test_answer_landing_after_the_close_snapshot_is_rejected():
+    live_round = open_round(['ana'])
+    live_round._answers = RacingAnswers(live_round, close_first=True)
+
+    assert not live_round.submit('ana', 'A')
+    assert live_round.result.answered == 0
+    assert live_round.correct_players() == []
+
+
+def test_answer_landing_before_the_close_snapshot_is_counted():
+    live_round = open_round(['ana'])
+    live_round._answers = RacingAnswers(live_round, close_first=False)
+
+    assert live_round.submit('ana', 'A')
+    assert live_round.result.answered == 1
+    assert live_round.correct_players() == ['ana']
+
+
+def test_session_scores_correct_players():
+    session = LiveSession({'ana': lambda payload: None, 'ben': lambda payload: None}, time_limit=60)
+    live_round = LiveRound(make_question(), 60)
+    live_round.open(session.participants)
+    live_round.submit('ana', 'A')
+    live_round.submit('ben', 'C')
+    live_round.close()
+
+    for player_id in live_round.correct_players():
+        session.scores[player_id] += 1
+
+    assert session.finish() == [('ana', 1), ('ben', 0)]
@@ -0,0 +1,42 @@
+import main
+import memory_report
+from leaderboard import Leaderboard
+from metrics import REGISTRY
+from quiz_loader import QuizLoader
+
+
+def test_metrics_render_refreshes_memory_gauges(bank_csv, capsys):
+    QuizLoader.clear_cache()
+    QuizLoader.load_questions(bank_csv)
+    leaderboard = Leaderboard()
+    try:
+        text = REGISTRY.render_text()
+    finally:
+        QuizLoader.clear_cache()
+
+    assert 'memory_bank_bytes{bank="bank.csv"}' in text
+    assert 'memory_tracked_bytes{kind="index"}' in text
+    assert leaderboard is not None
+
+
+def test_evicted_banks_drop_out_of_the_gauges(bank_csv, capsys):
+    QuizLoader.clear_cache()
+    QuizLoader.load_questions(bank_csv)
+    memory_report.collect_gauges()
+    QuizLoader.clear_cache()
+    memory_report.collect_gauges()
+
+    assert 'bank.csv' not in ''.join(memory_report.BANK_BYTES.render())
+
+
+def test_memory_command_writes_the_metrics_file(bank_csv, tmp_path, monkeypatch, capsys):
+    metrics_file = tmp_path / 'metrics.prom'
+    monkeypatch.setenv('QUIZ_METRICS_FILE', str(metrics_file))
+    monkeypatch.delenv('QUIZ_REVIEW_STATE', raising=False)
+    monkeypatch.delenv('QUIZ_LEADERBOARD_STATE', raising=False)
+    try:
+        assert main.main(['memory', bank_csv]) == 0
+    finally:
+        QuizLoader.clear_cache()
+
+    assert 'memory_bank_bytes_per_question{bank="bank.csv"}' in metrics_file.read_text()
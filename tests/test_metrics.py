@@ -0,0 +1,169 @@
+import pstats
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from metrics import MetricsRegistry, profile
+
+
+def test_counter_rejects_negative_amounts():
+    counter = MetricsRegistry().counter('requests_total', 'Requests')
+    counter.inc()
+    counter.inc(2, route='home')
+
+    with pytest.raises(ValueError):
+        counter.inc(-1)
+    assert counter.value() == 1
+    assert counter.value(route='home') == 2
+
+
+def test_metric_name_cannot_change_kind():
+    registry = MetricsRegistry()
+    assert registry.counter('things', 'Things') is registry.counter('things')
+
+    with pytest.raises(ValueError):
+        registry.gauge('things')
+
+
+def test_gauge_moves_both_ways():
+    gauge = MetricsRegistry().gauge('depth', 'Depth')
+    gauge.set(5)
+    gauge.inc(2)
+    gauge.dec(4)
+
+    assert gauge.value() == 3
+
+
+def test_histogram_places_values_in_inclusive_upper_buckets():
+    histogram = MetricsRegistry().histogram('latency', 'Latency', buckets=(1, 5, 10))
+    for value in (0.5, 1, 3, 5, 20):
+        histogram.observe(value)
+
+    lines = histogram.render()
+
+    assert 'latency_bucket{le="1"} 2' in lines
+    assert 'latency_bucket{le="5"} 4' in lines
+    assert 'latency_bucket{le="10"} 4' in lines
+    assert 'latency_bucket{le="+Inf"} 5' in lines
+    assert 'latency_sum 29.5' in lines
+    assert 'latency_count 5' in lines
+    assert histogram.value() == (5, 29.5)
+
+
+def test_histogram_labels_precede_le():
+    histogram = MetricsRegistry().histogram('latency', 'Latency', buckets=(1,))
+    histogram.observe(0.5, outcome='correct')
+
+    assert 'latency_bucket{outcome="correct",le="1"} 1' in histogram.render()
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter('files_total', 'Files').inc(path='C:\\data\\"new"\nbank')
+
+    assert 'files_total{path="C:\\\\data\\\\\\"new\\"\\nbank"} 1' in registry.render_text()
+
+
+def test_render_text_runs_collectors_and_survives_failures(capsys):
+    registry = MetricsRegistry()
+    gauge = registry.gauge('refreshed', 'Refreshed on render')
+    registry.add_collector(lambda: gauge.inc())
+
+    def broken():
+        raise RuntimeError('boom')
+
+    registry.add_collector(broken)
+
+    assert 'refreshed 1' in registry.render_text()
+    assert 'refreshed 2' in registry.render_text()
+    assert 'boom' in capsys.readouterr().err
+
+
+def test_dump_replaces_the_file_atomically(tmp_path, monkeypatch):
+    registry = MetricsRegistry()
+    registry.counter('dumps_total', 'Dumps').inc()
+    path = tmp_path / 'metrics.prom'
+    registry.dump(path)
+    assert 'dumps_total 1' in path.read_text()
+
+    def failing_render():
+        raise OSError('disk full')
+
+    monkeypatch.setattr(registry, 'render_text', failing_render)
+    with pytest.raises(OSError):
+        registry.dump(path)
+
+    assert 'dumps_total 1' in path.read_text()
+
+
+def test_http_endpoint_serves_metrics_and_404s_other_paths():
+    registry = MetricsRegistry()
+    registry.counter('hits_total', 'Hits').inc(3)
+    server = registry.start_http_server(0)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        with urllib.request.urlopen(f'{base}/metrics', timeout=5) as response:
+            body = response.read().decode('utf-8')
+            content_type = response.headers['Content-Type']
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(f'{base}/other', timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'hits_total 3' in body
+    assert content_type.startswith('text/plain')
+    assert missing.value.code == 404
+
+
+def busy(seconds=0.05):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_cprofile_mode_writes_pstats(tmp_path):
+    output = tmp_path / 'quiz.prof'
+    with profile(str(output), mode='cprofile'):
+        busy()
+
+    assert any('busy' in name for _, _, name in pstats.Stats(str(output)).stats)
+
+
+def test_sample_mode_writes_a_report(tmp_path):
+    output = tmp_path / 'samples.txt'
+    with profile(str(output), mode='sample'):
+        busy(0.1)
+
+    assert 'busy' in output.read_text()
+
+
+def test_profiling_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv('QUIZ_PROFILE', raising=False)
+    output = tmp_path / 'quiz.prof'
+    with profile(str(output)):
+        busy(0.001)
+
+    assert not output.exists()
+
+
+@pytest.mark.parametrize('value', ['1', 'true', 'CPROFILE-ish'])
+def test_unknown_profile_mode_warns_and_runs_unprofiled(value, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('QUIZ_PROFILE', value)
+    output = tmp_path / 'quiz.prof'
+    with profile(str(output)):
+        busy(0.001)
+
+    assert not output.exists()
+    assert 'Unknown profiling mode' in capsys.readouterr().err
+
+
+def test_profile_mode_from_environment_is_case_insensitive(tmp_path, monkeypatch):
+    monkeypatch.setenv('QUIZ_PROFILE', 'Sample')
+    output = tmp_path / 'samples.txt'
+    with profile(str(output)):
+        busy(0.05)
+
+    assert output.exists()
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+import shared_bank
+from quiz_loader import QuizLoader
+from shared_bank import SharedBankPublisher, SharedBankReader
+
+
+@pytest.fixture
+def publisher():
+    publisher = SharedBankPublisher(name=f'quiz_test_{os.getpid()}')
+    yield publisher
+    publisher.close()
+    QuizLoader.clear_cache()
+
+
+def test_reader_sees_published_questions(publisher, bank_csv):
+    publisher.publish([bank_csv])
+    reader = SharedBankReader(publisher.name)
+    try:
+        questions = reader.load_questions(bank_csv)
+        assert len(questions) == 12
+        assert questions[1].question == 'Question 1?'
+        assert questions[1].options == ['Alpha 1', 'Beta 1', 'Gamma 1', 'Delta 1']
+        assert questions[1].answer == 'B'
+    finally:
+        reader.close()
+
+
+def test_refresh_follows_a_swap_that_unlinks_the_generation_being_attached(publisher, bank_csv, monkeypatch):
+    publisher.publish([bank_csv])
+    reader = SharedBankReader(publisher.name)
+    publisher.publish([bank_csv])
+
+    attach = shared_bank._attach
+    swapped = []
+
+    def racing_attach(name):
+        # Publish generation 3 after the reader has read 2 from the counter
+        if name.endswith('_g2') and not swapped:
+            swapped.append(name)
+            publisher.publish([bank_csv])
+        return attach(name)
+
+    monkeypatch.setattr(shared_bank, '_attach', racing_attach)
+    try:
+        assert reader.refresh()
+        assert swapped == [f'{publisher.name}_g2']
+        assert reader.generation == 3
+        assert len(reader.load_questions(bank_csv)) == 12
+    finally:
+        reader.close()
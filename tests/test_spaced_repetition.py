@@ -0,0 +1,128 @@
+import os
+import random
+import tracemalloc
+
+import pytest
+
+from question import LoadQuestion
+from spaced_repetition import ReviewScheduler, UserReviewState, grade_answer, question_key
+
+
+def make_question(i):
+    return LoadQuestion('Science', 'Physics', f'Question {i}?', ['One', 'Two', 'Three', 'Four'], 'A')
+
+
+def test_grade_answer_rewards_fast_correct_answers():
+    assert grade_answer(True, 2, 30) == 5
+    assert grade_answer(True, 25, 30) == 3
+    assert grade_answer(False, 2, 30) == 2
+    assert grade_answer(False, None, 30) == 0
+
+
+def test_two_reviews_due_the_same_day_return_the_key_once():
+    state = UserReviewState()
+    # Both failed reviews reschedule for day 11, leaving two valid heap entries
+    state.review(7, 1, 10)
+    state.review(7, 1, 10)
+
+    assert state.due_keys(11, 10) == [7]
+    assert state.due_keys(11, 10) == [7]
+
+
+def test_due_keys_are_most_overdue_first():
+    state = UserReviewState()
+    state.review(1, 1, 5)
+    state.review(2, 1, 3)
+    state.review(3, 5, 20)
+
+    assert state.due_keys(10, 10) == [2, 1]
+    assert state.due_keys(10, 1) == [2]
+
+
+def test_select_puts_due_questions_first():
+    scheduler = ReviewScheduler()
+    questions = [make_question(i) for i in range(10)]
+    scheduler.record('ana', questions[4], 1, day=100)
+
+    selected = scheduler.select('ana', questions, 3, day=101)
+
+    assert selected[0] is questions[4]
+    assert len(set(map(question_key, selected))) == 3
+
+
+def test_save_round_trips_and_replaces_atomically(tmp_path):
+    path = tmp_path / 'reviews.bin'
+    scheduler = ReviewScheduler()
+    scheduler.record('ana', make_question(1), 5, day=100)
+    scheduler.record('ben', make_question(2), 1, day=100)
+    scheduler.save(path)
+
+    restored = ReviewScheduler.load(path)
+
+    assert restored.due('ben', 5, day=101) == [question_key(make_question(2))]
+    assert restored.due('ana', 5, day=101) == [question_key(make_question(1))]
+    assert os.listdir(tmp_path) == ['reviews.bin']
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / 'reviews.bin'
+    scheduler = ReviewScheduler()
+    scheduler.record('ana', make_question(1), 5, day=100)
+    scheduler.save(path)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with pytest.raises(ValueError):
+        ReviewScheduler.load(path)
+
+
+def test_corrupt_state_file_starts_a_fresh_scheduler(tmp_path, monkeypatch):
+    import main
+
+    path = tmp_path / 'reviews.bin'
+    path.write_bytes(b'QZ')
+    monkeypatch.setenv('QUIZ_REVIEW_STATE', str(path))
+
+    scheduler, state_file = main.load_review_scheduler()
+
+    assert isinstance(scheduler, ReviewScheduler)
+    assert state_file == str(path)
+
+
+def test_due_keys_match_a_full_sort_after_many_reviews():
+    rng = random.Random(7)
+    state = UserReviewState()
+    for _ in range(2000):
+        state.review(rng.randrange(300), rng.randrange(6), rng.randrange(100))
+
+    expected = sorted((state.due[slot], slot) for slot in range(len(state)) if state.due[slot] <= 60)
+    assert state.due_keys(60, 10 ** 6) == [state.keys[slot] for _, slot in expected]
+    assert state.due_keys(60, 5) == [state.keys[slot] for _, slot in expected[:5]]
+
+
+def test_state_survives_a_round_trip_through_bytes():
+    state = UserReviewState()
+    for key in (40, 10, 30, 20):
+        state.review(key, 1, key)
+
+    restored = UserReviewState.from_bytes(state.to_bytes(), len(state))
+
+    assert restored.due_keys(100, 10) == state.due_keys(100, 10) == [10, 20, 30, 40]
+    assert 30 in restored and 35 not in restored
+    restored.review(10, 5, 100)
+    assert restored.due_keys(100, 10) == [20, 30, 40]
+
+
+def test_resident_bytes_per_pair_stay_compact():
+    keys = random.Random(11).sample(range(2 ** 32), 20000)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        state = UserReviewState()
+        for day, key in enumerate(keys):
+            state.review(key, 4, day % 365)
+        resident = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(state) == len(keys)
+    assert resident / len(keys) < 32